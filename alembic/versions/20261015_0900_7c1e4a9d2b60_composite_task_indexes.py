@@ -0,0 +1,32 @@
+"""Replace single-column task indexes with per-user composite indexes
+
+Revision ID: 7c1e4a9d2b60
+Revises: 3fe653c878f9
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4a9d2b60'
+down_revision: Union[str, None] = '3fe653c878f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_tasks_user_state', 'tasks', ['user_id', 'state'], unique=False)
+    op.drop_index(op.f('ix_tasks_user_id'), table_name='tasks')
+    op.drop_index(op.f('ix_tasks_created_at'), table_name='tasks')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_tasks_created_at'), 'tasks', ['created_at'], unique=False)
+    op.create_index(op.f('ix_tasks_user_id'), 'tasks', ['user_id'], unique=False)
+    op.drop_index('ix_tasks_user_state', table_name='tasks')
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
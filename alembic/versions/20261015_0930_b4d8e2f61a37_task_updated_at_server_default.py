@@ -0,0 +1,26 @@
+"""Stamp tasks.updated_at on the server
+
+Revision ID: b4d8e2f61a37
+Revises: 7c1e4a9d2b60
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8e2f61a37'
+down_revision: Union[str, None] = '7c1e4a9d2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('tasks', 'updated_at', server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"))
+
+
+def downgrade() -> None:
+    op.alter_column('tasks', 'updated_at', server_default=None)
@@ -0,0 +1,28 @@
+"""Extend the per-user task listing index with id for keyset pagination
+
+Revision ID: e91f3c5a7d24
+Revises: b4d8e2f61a37
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91f3c5a7d24'
+down_revision: Union[str, None] = 'b4d8e2f61a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_user_created_id', 'tasks', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
+
+
+def downgrade() -> None:
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', sa.text('created_at DESC')], unique=False)
+    op.drop_index('ix_tasks_user_created_id', table_name='tasks')
@@ -1,19 +1,33 @@
 """
 Async authentication utilities for JWT token handling and password management
+
+Compare tokens, secrets, and hashes with secure_str_eq (constant time, from
+app.core.security and re-exported here), never with == or !=.
 """
 
+import asyncio
+import base64
+import hashlib
 import os
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from threading import Lock
+from typing import Optional, Tuple
+import orjson
+from cachetools import TTLCache
+import jwt
+from jwt import PyJWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
 from dotenv import load_dotenv
 
 from app.core.database import get_db
+from app.core.security import secure_str_eq  # noqa: F401  (re-exported)
+from app.core.user_cache import USER_BY_USERNAME, get_user_cached, invalidate_user
 from app.models.models import User
 from app.core.logging_config import SecurityLogger, get_logger
 
@@ -29,9 +43,31 @@ if not SECRET_KEY:
 
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+_DEFAULT_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Decoded token cache: clients reuse the same bearer token across many calls,
+# so remember the extracted username until the entry (or the token) expires
+TOKEN_CACHE_TTL_SECONDS = 60
+_token_cache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = Lock()
+
+# Password hashing - new hashes use Argon2id (costs tunable per deployment);
+# existing bcrypt hashes still verify and are replaced on the user's next login
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Verified against when the username does not exist, to equalize login timing
+# (with users whose hash is current; legacy bcrypt ones differ until rehashed)
+_DUMMY_HASH = pwd_context.hash("dummy-password-for-timing")
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -47,31 +83,93 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password in a worker thread; on success also return a new hash
+    when the stored one uses a deprecated scheme or outdated costs
+    """
+    return await asyncio.to_thread(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in a worker thread so the event loop is not blocked"""
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-
-    to_encode.update({"exp": expire})
+    # exp is a NumericDate, so plain epoch seconds avoid datetime entirely
+    ttl = expires_delta.total_seconds() if expires_delta else _DEFAULT_EXPIRE_SECONDS
+    expire = int(time.time() + ttl)
+    to_encode = {**data, "exp": expire}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str, credentials_exception):
-    """Verify and decode JWT token"""
+def _token_cache_key(token: str) -> bytes:
+    """Bounded-size cache key for a raw JWT"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _unverified_expiry(token: str) -> float:
+    """Read the exp claim without checking the signature (pre-check only)"""
+    _, payload_segment, _ = token.split(".")
+    padded = payload_segment + "=" * (-len(payload_segment) % 4)
+    payload = orjson.loads(base64.urlsafe_b64decode(padded))
+    return payload.get("exp", float("inf"))
+
+
+def get_token_subject(token: str) -> Optional[str]:
+    """Return the username from a valid JWT, or None (cached per token)"""
+    cache_key = _token_cache_key(token)
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        username, expires_at = cached
+        if expires_at > time.time():
+            return username
+
+    # Reject malformed or expired tokens before paying for signature checks
+    try:
+        expired = _unverified_expiry(token) < time.time()
+    except (ValueError, TypeError, AttributeError):
+        logger.warning("Token verification failed: malformed token")
+        return None
+    if expired:
+        logger.warning("Token verification failed: token has expired")
+        return None
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            logger.warning("Token verification failed: no username in token")
-            raise credentials_exception
-        return username
-    except JWTError as e:
-        logger.warning(f"Token verification failed: {str(e)}")
+    except PyJWTError as e:
+        with _token_cache_lock:
+            _token_cache.pop(cache_key, None)
+        logger.warning("Token verification failed: %s", e)
+        return None
+
+    username: str = payload.get("sub")
+    if username is None:
+        logger.warning("Token verification failed: no username in token")
+        return None
+
+    # Never cache a token past its own expiry
+    now = time.time()
+    expires_at = min(now + TOKEN_CACHE_TTL_SECONDS, payload.get("exp", now))
+    with _token_cache_lock:
+        _token_cache[cache_key] = (username, expires_at)
+    return username
+
+
+def verify_token(token: str, credentials_exception):
+    """Verify and decode JWT token, raising credentials_exception if invalid"""
+    username = get_token_subject(token)
+    if username is None:
         raise credentials_exception
+    return username
 
 
 async def get_current_user(
@@ -87,48 +185,96 @@ async def get_current_user(
     username = verify_token(token, credentials_exception)
 
     try:
-        # Use async database query
-        result = await db.execute(select(User).where(User.username == username))
-        user = result.scalar_one_or_none()
+        # Served from the user cache when possible
+        user = await get_user_cached(db, username)
 
         if user is None:
-            logger.warning(f"User not found in database: {username}")
+            logger.warning("User not found in database: %s", username)
             raise credentials_exception
 
         return user
 
     except Exception as e:
-        logger.error(f"Error getting user from database: {str(e)}", exc_info=True)
+        logger.error("Error getting user from database: %s", e, exc_info=True)
         raise credentials_exception
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+async def get_current_active_user(
+    request: Request, current_user: User = Depends(get_current_user)
+):
     """Get current active user (async version)"""
     # Store user ID in request state for logging middleware
-    # Note: This will be available in the request context
+    request.state.user_id = str(current_user.id)
     return current_user
 
 
+@dataclass(frozen=True)
+class RequestContext:
+    """Authenticated user and client details shared by audited handlers"""
+
+    user: User
+    client_ip: str
+    user_agent: str
+
+
+async def get_request_context(
+    request: Request, current_user: User = Depends(get_current_active_user)
+) -> RequestContext:
+    """Resolve the user and client details once per request"""
+    return RequestContext(
+        user=current_user,
+        client_ip=request.client.host if request.client else "unknown",
+        user_agent=request.headers.get("user-agent", "unknown"),
+    )
+
+
 async def authenticate_user(db: AsyncSession, username: str, password: str):
     """Authenticate user with username and password (async)"""
     try:
-        result = await db.execute(select(User).where(User.username == username))
+        result = await db.execute(USER_BY_USERNAME, {"username": username})
         user = result.scalar_one_or_none()
 
-        if not user:
-            logger.debug(f"Authentication failed: user not found: {username}")
-            return False
-        if not verify_password(password, user.hashed_password):
-            logger.warning(
-                f"Authentication failed: invalid password for user: {username}"
-            )
+        # Always run exactly one hash verification so response time does not
+        # reveal whether the username exists
+        hashed_password = user.hashed_password if user else _DUMMY_HASH
+        password_ok, new_hash = await verify_and_update_password_async(
+            password, hashed_password
+        )
+        authenticated = user is not None and password_ok
+
+        if not authenticated:
+            if user is None:
+                logger.debug("Authentication failed: user not found: %s", username)
+            else:
+                logger.warning(
+                    "Authentication failed: invalid password for user: %s", username
+                )
             return False
 
-        logger.debug(f"User authenticated successfully: {username}")
+        if new_hash is not None:
+            await _store_rehashed_password(db, user, new_hash)
+
+        logger.debug("User authenticated successfully: %s", username)
         return user
 
     except Exception as e:
         logger.error(
-            f"Error during authentication for user {username}: {str(e)}", exc_info=True
+            "Error during authentication for user %s: %s", username, e, exc_info=True
         )
         return False
+
+
+async def _store_rehashed_password(db: AsyncSession, user: User, new_hash: str):
+    """Replace a legacy password hash; a failure here must not fail the login"""
+    try:
+        await db.execute(
+            update(User).where(User.id == user.id).values(hashed_password=new_hash)
+        )
+        await db.commit()
+        invalidate_user(user.username)
+        logger.info("Upgraded password hash for user: %s", user.username)
+    except Exception as e:
+        # Left to get_db to roll back, so the loaded user stays readable
+        logger.warning(
+            "Could not upgrade password hash for user %s: %s", user.username, e
+        )
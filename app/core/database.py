@@ -1,3 +1,4 @@
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlmodel import SQLModel
 import os
@@ -17,20 +18,49 @@ if DATABASE_URL.startswith("postgresql://"):
 else:
     ASYNC_DATABASE_URL = DATABASE_URL
 
+# Open the pool's base connections at startup (set WARM_POOL=0 to skip, e.g. tests)
+WARM_POOL = os.getenv("WARM_POOL", "1") == "1"
+
+# Create missing tables at startup (set CREATE_TABLES=0 when migrations are
+# applied separately, e.g. alembic upgrade head in the deploy entrypoint)
+CREATE_TABLES = os.getenv("CREATE_TABLES", "1") == "1"
+
+# Advisory lock key serializing startup DDL across workers
+_SCHEMA_LOCK_KEY = 0x7461736B  # "task"
+
+# Connection pool settings, tunable per deployment
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+# Compiled SQL statements kept per engine (SQLAlchemy default is 500)
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+
 # Create async SQLModel engine with high-concurrency optimized settings
+# (async engines default to AsyncAdaptedQueuePool, the asyncio-safe queue pool)
 async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
     echo=False,  # Disable SQL logging in production
-    pool_size=20,  # Increased base connection pool for high concurrency
-    max_overflow=30,  # Additional connections when pool is full (total: 50)
-    pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=1800,  # Recycle connections after 30 minutes (faster refresh)
+    query_cache_size=DB_QUERY_CACHE_SIZE,
+    pool_size=DB_POOL_SIZE,  # Base connection pool for high concurrency
+    max_overflow=DB_MAX_OVERFLOW,  # Additional connections when pool is full
+    pool_pre_ping=DB_POOL_PRE_PING,  # Verify connections before use
+    pool_recycle=DB_POOL_RECYCLE,  # Recycle connections (default 30 minutes)
+    pool_use_lifo=True,  # Reuse the most recent connection to keep a hot working set
+    pool_reset_on_return=None,  # Sessions always commit/rollback before checkin
     # Async specific settings optimized for concurrency
-    pool_timeout=10,  # Reduced timeout for faster fail-over
+    pool_timeout=DB_POOL_TIMEOUT,  # Short timeout for faster fail-over
     connect_args={
         "command_timeout": 30,  # Reduced command timeout
+        "statement_cache_size": 1024,  # asyncpg server-side statement cache
+        "prepared_statement_cache_size": 512,  # SQLAlchemy prepared statement LRU
         "server_settings": {
             "jit": "off",  # Disable JIT for better performance in some cases
+            # Let the server notice dead clients (e.g. behind NAT/LBs) quickly
+            "tcp_keepalives_idle": "30",
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "3",
         },
     },
 )
@@ -46,14 +76,12 @@ AsyncSessionLocal = async_sessionmaker(
 # Async dependency to get database session
 async def get_db():
     """
-    Creates an async database session and ensures it's closed after use.
+    Creates an async database session; the context manager closes it (rolling
+    back any uncommitted transaction) after use.
     This will be used as a dependency in our FastAPI endpoints.
     """
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
 
 
 # Function to create tables (for initialization)
@@ -63,9 +91,30 @@ async def create_tables():
     This should be called during application startup.
     """
     async with async_engine.begin() as conn:
+        # Workers booting together take turns; the lock is released at commit
+        # and later workers find the tables already there
+        if conn.dialect.name == "postgresql":
+            await conn.execute(select(func.pg_advisory_xact_lock(_SCHEMA_LOCK_KEY)))
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
+# Function to warm up the connection pool (for initialization)
+async def warm_pool():
+    """
+    Open and ping pool_size connections so they are ready before traffic.
+    This should be called during application startup, after create_tables.
+    """
+    connections = [
+        await async_engine.connect() for _ in range(async_engine.pool.size())
+    ]
+    try:
+        for conn in connections:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            await conn.close()
+
+
 # Function to close the engine (for cleanup)
 async def close_async_engine():
     """
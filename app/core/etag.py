@@ -0,0 +1,37 @@
+"""
+Weak ETag helpers for conditional GETs
+
+Clients that poll a resource send back the ETag they last saw in
+If-None-Match; when it still matches, the endpoint answers 304 Not Modified
+and skips serializing and sending the body.
+"""
+
+from datetime import datetime
+import uuid
+
+from fastapi import Request, Response, status
+
+
+def weak_etag(resource_id: uuid.UUID, version: datetime) -> str:
+    """Weak ETag for a resource at a given modification time"""
+    return f'W/"{resource_id.hex}-{version:%Y%m%d%H%M%S%f}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match covers the given ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore W/ prefixes
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
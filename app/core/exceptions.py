@@ -3,39 +3,63 @@ Custom exception handlers for production error handling
 """
 
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import itertools
+import logging
+import os
 import time
-from typing import Union
-import uuid
+from typing import Optional, Union
 
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Error IDs only need to be unique within a deployment, so a per-process
+# prefix plus a counter is enough (and much cheaper than uuid4)
+_ERROR_ID_PREFIX = f"{int(time.time()):x}{os.getpid():x}"
+_error_counter = itertools.count()
+
+
+def _new_error_id() -> str:
+    """Generate a unique error ID for correlating logs with responses"""
+    return f"{_ERROR_ID_PREFIX}-{next(_error_counter):x}"
+
+
+def _log_context(request: Request, url: str, error_id: Optional[str], **extra) -> dict:
+    """Build the structured logging context shared by all handlers"""
+    context = {
+        "error_id": error_id,
+        "method": request.method,
+        "url": url,
+        "ip_address": request.client.host if request.client else "unknown",
+        "user_agent": request.headers.get("user-agent", "unknown"),
+    }
+    context.update(extra)
+    return context
+
 
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with detailed logging"""
-    error_id = str(uuid.uuid4())
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    # Error IDs are only needed to correlate server-side failures
+    error_id = _new_error_id() if exc.status_code >= 500 else None
 
     # Log with contextual information
-    logger.warning(
-        f"HTTP {exc.status_code} error at {request.url}: {exc.detail}",
-        extra={
-            "error_id": error_id,
-            "status_code": exc.status_code,
-            "method": request.method,
-            "url": str(request.url),
-            "ip_address": client_ip,
-            "user_agent": user_agent,
-            "error_detail": exc.detail,
-        },
-    )
+    if logger.isEnabledFor(logging.WARNING):
+        url = str(request.url)
+        logger.warning(
+            f"HTTP {exc.status_code} error at {url}: {exc.detail}",
+            extra=_log_context(
+                request,
+                url,
+                error_id,
+                status_code=exc.status_code,
+                error_detail=exc.detail,
+            ),
+        )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
@@ -43,39 +67,36 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "status_code": exc.status_code,
             "message": exc.detail,
             "timestamp": time.time(),
-            "path": str(request.url),
+            "path": request.url.path,
         },
+        # e.g. WWW-Authenticate on 401, Retry-After on 429
+        headers=getattr(exc, "headers", None),
     )
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle Pydantic validation errors with user-friendly messages"""
-    error_id = str(uuid.uuid4())
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    error_id = None
 
     # Log validation errors with context
-    logger.warning(
-        f"Validation error at {request.url}: {exc.errors()}",
-        extra={
-            "error_id": error_id,
-            "method": request.method,
-            "url": str(request.url),
-            "ip_address": client_ip,
-            "user_agent": user_agent,
-            "validation_errors": exc.errors(),
-        },
-    )
-
-    # Format validation errors in a user-friendly way
-    errors = []
-    for error in exc.errors():
-        field_path = " -> ".join(str(loc) for loc in error["loc"])
-        errors.append(
-            {"field": field_path, "message": error["msg"], "type": error["type"]}
+    if logger.isEnabledFor(logging.WARNING):
+        url = str(request.url)
+        logger.warning(
+            f"Validation error at {url}: {exc.errors()}",
+            extra=_log_context(request, url, error_id, validation_errors=exc.errors()),
         )
 
-    return JSONResponse(
+    # Format validation errors in a user-friendly way
+    errors = [
+        {
+            "field": " -> ".join(str(loc) for loc in error["loc"]),
+            "message": error["msg"],
+            "type": error["type"],
+        }
+        for error in exc.errors()
+    ]
+
+    return ORJSONResponse(
         status_code=422,
         content={
             "error": True,
@@ -84,32 +105,27 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "message": "Validation failed",
             "details": errors,
             "timestamp": time.time(),
-            "path": str(request.url),
+            "path": request.url.path,
         },
     )
 
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected errors with logging"""
-    error_id = str(uuid.uuid4())
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    error_id = _new_error_id()
 
     # Log critical errors with full context
-    logger.error(
-        f"Unexpected error at {request.url}: {str(exc)}",
-        extra={
-            "error_id": error_id,
-            "method": request.method,
-            "url": str(request.url),
-            "ip_address": client_ip,
-            "user_agent": user_agent,
-            "exception_type": type(exc).__name__,
-        },
-        exc_info=True,
-    )
+    if logger.isEnabledFor(logging.ERROR):
+        url = str(request.url)
+        logger.error(
+            f"Unexpected error at {url}: {str(exc)}",
+            extra=_log_context(
+                request, url, error_id, exception_type=type(exc).__name__
+            ),
+            exc_info=True,
+        )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": True,
@@ -117,30 +133,23 @@ async def general_exception_handler(request: Request, exc: Exception):
             "status_code": 500,
             "message": "Internal server error",
             "timestamp": time.time(),
-            "path": str(request.url),
+            "path": request.url.path,
         },
     )
 
 
 async def starlette_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle Starlette HTTP exceptions"""
-    error_id = str(uuid.uuid4())
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    error_id = _new_error_id() if exc.status_code >= 500 else None
 
-    logger.warning(
-        f"Starlette HTTP {exc.status_code} error at {request.url}",
-        extra={
-            "error_id": error_id,
-            "status_code": exc.status_code,
-            "method": request.method,
-            "url": str(request.url),
-            "ip_address": client_ip,
-            "user_agent": user_agent,
-        },
-    )
+    if logger.isEnabledFor(logging.WARNING):
+        url = str(request.url)
+        logger.warning(
+            f"Starlette HTTP {exc.status_code} error at {url}",
+            extra=_log_context(request, url, error_id, status_code=exc.status_code),
+        )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
@@ -148,6 +157,8 @@ async def starlette_exception_handler(request: Request, exc: StarletteHTTPExcept
             "status_code": exc.status_code,
             "message": exc.detail,
             "timestamp": time.time(),
-            "path": str(request.url),
+            "path": request.url.path,
         },
+        # e.g. WWW-Authenticate on 401, Retry-After on 429
+        headers=getattr(exc, "headers", None),
     )
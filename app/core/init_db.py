@@ -1,25 +1,38 @@
+import asyncio
+
 from sqlmodel import SQLModel
-from app.core.database import engine
+from app.core.database import async_engine, create_tables as create_all_tables
 from app.models.models import User, Task
 
 
+async def _create_tables():
+    await create_all_tables()
+    await async_engine.dispose()
+
+
 def create_tables():
     """
     Create all tables in the database.
     This function will create the tables based on our SQLModel models.
     """
     print("Creating database tables...")
-    SQLModel.metadata.create_all(engine)
+    asyncio.run(_create_tables())
     print("Database tables created successfully!")
 
 
+async def _drop_tables():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+    await async_engine.dispose()
+
+
 def drop_tables():
     """
     Drop all tables in the database.
     Use with caution - this will delete all data!
     """
     print("Dropping database tables...")
-    SQLModel.metadata.drop_all(engine)
+    asyncio.run(_drop_tables())
     print("Database tables dropped!")
 
 
@@ -6,16 +6,21 @@ Provides error logging, audit logging, and request/response logging
 import logging
 import logging.handlers
 import os
-import json
 import sys
-from datetime import datetime
-from typing import Dict, Any, Optional
+import threading
+import time
+from queue import SimpleQueue
+from typing import Dict, Any, List, Optional
 from pathlib import Path
+import orjson
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Background listeners (by logger name) that perform the blocking handler I/O
+_queue_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter that adds colors to console output"""
@@ -30,19 +35,57 @@ class ColoredFormatter(logging.Formatter):
         "RESET": "\033[0m",  # Reset
     }
 
-    def format(self, record):
-        if hasattr(record, "levelname"):
-            color = self.COLORS.get(record.levelname, self.COLORS["RESET"])
-            record.levelname = f"{color}{record.levelname}{self.COLORS['RESET']}"
-        return super().format(record)
+    def __init__(self, *args, stream=sys.stdout, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Colors only help a terminal; redirected output gets plain lines
+        isatty = getattr(stream, "isatty", None)
+        self._enabled = bool(isatty and isatty())
+
+    def formatMessage(self, record):
+        if not self._enabled:
+            return super().formatMessage(record)
+        # Color a copy so the other handlers sharing this record stay plain
+        colored = logging.makeLogRecord(record.__dict__)
+        color = self.COLORS.get(record.levelname, self.COLORS["RESET"])
+        colored.levelname = f"{color}{record.levelname}{self.COLORS['RESET']}"
+        return super().formatMessage(colored)
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recently formatted record;
+# replaced as a whole tuple so concurrent listener threads never see a mix
+_ts_cache = (0, "")
+
+
+def _iso_timestamp(created: float) -> str:
+    """ISO-8601 UTC timestamp for a record, rebuilding the date part at most 1/s"""
+    global _ts_cache
+    second = int(created)
+    cached_second, prefix = _ts_cache
+    if cached_second != second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_cache = (second, prefix)
+    return f"{prefix}.{int((created - second) * 1_000_000):06d}Z"
 
 
 class JsonFormatter(logging.Formatter):
     """Custom formatter that outputs JSON for structured logging"""
 
+    _EXTRA_KEYS = (
+        "user_id",
+        "request_id",
+        "ip_address",
+        "method",
+        "url",
+        "status_code",
+        "response_time",
+        "action",
+        "resource",
+        "resource_id",
+    )
+
     def format(self, record):
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _iso_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -51,32 +94,140 @@ class JsonFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add extra fields if present
-        if hasattr(record, "user_id"):
-            log_entry["user_id"] = record.user_id
-        if hasattr(record, "request_id"):
-            log_entry["request_id"] = record.request_id
-        if hasattr(record, "ip_address"):
-            log_entry["ip_address"] = record.ip_address
-        if hasattr(record, "method"):
-            log_entry["method"] = record.method
-        if hasattr(record, "url"):
-            log_entry["url"] = record.url
-        if hasattr(record, "status_code"):
-            log_entry["status_code"] = record.status_code
-        if hasattr(record, "response_time"):
-            log_entry["response_time"] = record.response_time
-        if hasattr(record, "action"):
-            log_entry["action"] = record.action
-        if hasattr(record, "resource"):
-            log_entry["resource"] = record.resource
-        if hasattr(record, "resource_id"):
-            log_entry["resource_id"] = record.resource_id
+        # Add extra fields if present (one dict lookup each, no hasattr)
+        record_dict = record.__dict__
+        for key in self._EXTRA_KEYS:
+            value = record_dict.get(key)
+            if value is not None:
+                log_entry[key] = value
 
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_entry)
+        return orjson.dumps(log_entry, default=str).decode()
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that batches writes: formatted records are buffered
+    and written in one call once buffer_size bytes are pending, or at most
+    flush_interval seconds after the first buffered record. With buffer_size=0
+    every record is written and flushed as it is emitted
+    """
+
+    def __init__(
+        self,
+        *args,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 0.25,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._timer: Optional[threading.Timer] = None
+        # Bytes in the current file, including buffered ones; like the stdlib
+        # handler this counts characters of the formatted message
+        self._bytes_written = (
+            os.path.getsize(self.baseFilename)
+            if os.path.exists(self.baseFilename)
+            else 0
+        )
+
+    def shouldRollover(self, record):
+        """Size check from a running byte count (no seek/tell per record)"""
+        return self.maxBytes > 0 and self._bytes_written >= self.maxBytes
+
+    def doRollover(self):
+        super().doRollover()
+        self._bytes_written = 0
+
+    def emit(self, record):
+        # Called by Handler.handle with self.lock held
+        try:
+            msg = self.format(record) + self.terminator
+            if self.maxBytes > 0 and self._bytes_written + len(msg) >= self.maxBytes:
+                self._write_buffer()
+                self.doRollover()
+            self._buffer.append(msg)
+            self._buffered += len(msg)
+            self._bytes_written += len(msg)
+            if self._buffered >= self.buffer_size:
+                self._write_buffer()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _write_buffer(self):
+        """Write pending records to the stream (caller holds self.lock)"""
+        if self._buffer:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write("".join(self._buffer))
+            self.stream.flush()
+            self._buffer.clear()
+            self._buffered = 0
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._write_buffer()
+            super().flush()
+        finally:
+            self.release()
+
+
+# JsonFormatter is stateless, so the audit/security/access handlers share one
+_JSON_FORMATTER = JsonFormatter()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched; the stock prepare()
+    merges args and renders tracebacks in the caller's thread, which for a
+    request handler means on the event loop
+    """
+
+    def prepare(self, record):
+        # The queue never leaves this process, so nothing needs pickling
+        return record
+
+
+def _attach_queue_handler(logger: logging.Logger, handlers: List[logging.Handler]):
+    """
+    Route a logger's records through a queue to a background listener thread,
+    so callers only enqueue and formatting/disk I/O happen off the event loop
+    """
+    previous = _queue_listeners.pop(logger.name, None)
+    if previous is not None:
+        previous.stop()
+
+    queue = SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        queue, *handlers, respect_handler_level=True
+    )
+    logger.addHandler(DeferredQueueHandler(queue))
+    listener.start()
+    _queue_listeners[logger.name] = listener
+
+
+def stop_logging():
+    """Flush pending records and stop the background logging threads"""
+    while _queue_listeners:
+        listener = _queue_listeners.popitem()[1]
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
 
 
 def setup_logging():
@@ -95,12 +246,12 @@ def setup_logging():
     console_formatter = ColoredFormatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
+        stream=console_handler.stream,
     )
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
 
     # File handler for general application logs (includes DEBUG)
-    file_handler = logging.handlers.RotatingFileHandler(
+    file_handler = BufferedRotatingFileHandler(
         LOGS_DIR / "app.log", maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
     )
     file_handler.setLevel(logging.DEBUG)  # Changed to DEBUG to capture all logs
@@ -109,10 +260,9 @@ def setup_logging():
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
 
     # Separate DEBUG file handler for detailed debugging
-    debug_handler = logging.handlers.RotatingFileHandler(
+    debug_handler = BufferedRotatingFileHandler(
         LOGS_DIR / "debug.log", maxBytes=10 * 1024 * 1024, backupCount=3  # 10MB
     )
     debug_handler.setLevel(logging.DEBUG)
@@ -121,19 +271,22 @@ def setup_logging():
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     debug_handler.setFormatter(debug_formatter)
-    root_logger.addHandler(debug_handler)
 
     # Error file handler
-    error_handler = logging.handlers.RotatingFileHandler(
+    error_handler = BufferedRotatingFileHandler(
         LOGS_DIR / "errors.log", maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
     )
     error_handler.setLevel(logging.ERROR)
+    # Formatter.format appends the traceback itself
     error_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s - [%(filename)s:%(lineno)d]\n%(exc_text)s",
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s - [%(filename)s:%(lineno)d]",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     error_handler.setFormatter(error_formatter)
-    root_logger.addHandler(error_handler)
+
+    _attach_queue_handler(
+        root_logger, [console_handler, file_handler, debug_handler, error_handler]
+    )
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -151,12 +304,16 @@ def setup_audit_logger():
     audit_logger.handlers.clear()
 
     # Audit file handler with JSON formatting
-    audit_handler = logging.handlers.RotatingFileHandler(
-        LOGS_DIR / "audit.log", maxBytes=10 * 1024 * 1024, backupCount=10  # 10MB
+    # Unbuffered: a crash must not drop the latest audit events
+    audit_handler = BufferedRotatingFileHandler(
+        LOGS_DIR / "audit.log",
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=10,
+        buffer_size=0,
     )
     audit_handler.setLevel(logging.INFO)
-    audit_handler.setFormatter(JsonFormatter())
-    audit_logger.addHandler(audit_handler)
+    audit_handler.setFormatter(_JSON_FORMATTER)
+    _attach_queue_handler(audit_logger, [audit_handler])
 
     return audit_logger
 
@@ -171,12 +328,16 @@ def setup_security_logger():
     security_logger.handlers.clear()
 
     # Security file handler with JSON formatting
-    security_handler = logging.handlers.RotatingFileHandler(
-        LOGS_DIR / "security.log", maxBytes=10 * 1024 * 1024, backupCount=10  # 10MB
+    # Unbuffered: a crash must not drop the latest security events
+    security_handler = BufferedRotatingFileHandler(
+        LOGS_DIR / "security.log",
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=10,
+        buffer_size=0,
     )
     security_handler.setLevel(logging.INFO)
-    security_handler.setFormatter(JsonFormatter())
-    security_logger.addHandler(security_handler)
+    security_handler.setFormatter(_JSON_FORMATTER)
+    _attach_queue_handler(security_logger, [security_handler])
 
     return security_logger
 
@@ -191,12 +352,12 @@ def setup_access_logger():
     access_logger.handlers.clear()
 
     # Access file handler with JSON formatting
-    access_handler = logging.handlers.RotatingFileHandler(
+    access_handler = BufferedRotatingFileHandler(
         LOGS_DIR / "access.log", maxBytes=10 * 1024 * 1024, backupCount=10  # 10MB
     )
     access_handler.setLevel(logging.INFO)
-    access_handler.setFormatter(JsonFormatter())
-    access_logger.addHandler(access_handler)
+    access_handler.setFormatter(_JSON_FORMATTER)
+    _attach_queue_handler(access_logger, [access_handler])
 
     return access_logger
 
@@ -207,6 +368,11 @@ security_logger = setup_security_logger()
 access_logger = setup_access_logger()
 
 
+def _without_none(items) -> Dict[str, Any]:
+    """Build a logging extra dict from (key, value) pairs, dropping None values"""
+    return {key: value for key, value in items if value is not None}
+
+
 class AuditLogger:
     """Helper class for audit logging"""
 
@@ -221,21 +387,20 @@ class AuditLogger:
         user_agent: str = None,
     ):
         """Log user actions for audit purposes"""
-        extra = {
-            "user_id": user_id,
-            "action": action,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-        }
-
-        if resource:
-            extra["resource"] = resource
-        if resource_id:
-            extra["resource_id"] = resource_id
+        extra = _without_none(
+            (
+                ("user_id", user_id),
+                ("action", action),
+                ("ip_address", ip_address),
+                ("user_agent", user_agent),
+                ("resource", resource),
+                ("resource_id", resource_id),
+            )
+        )
         if details:
             extra.update(details)
 
-        audit_logger.info(f"User {user_id} performed action: {action}", extra=extra)
+        audit_logger.info("User %s performed action: %s", user_id, action, extra=extra)
 
 
 class SecurityLogger:
@@ -250,16 +415,16 @@ class SecurityLogger:
         failure_reason: str = None,
     ):
         """Log login attempts"""
-        extra = {
-            "action": "login_attempt",
-            "username": username,
-            "success": success,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-        }
-
-        if failure_reason and not success:
-            extra["failure_reason"] = failure_reason
+        extra = _without_none(
+            (
+                ("action", "login_attempt"),
+                ("username", username),
+                ("success", success),
+                ("ip_address", ip_address),
+                ("user_agent", user_agent),
+                ("failure_reason", None if success else failure_reason),
+            )
+        )
 
         message = f"Login {'successful' if success else 'failed'} for user: {username}"
         if not success and failure_reason:
@@ -277,17 +442,17 @@ class SecurityLogger:
         failure_reason: str = None,
     ):
         """Log user registration attempts"""
-        extra = {
-            "action": "user_registration",
-            "username": username,
-            "email": email,
-            "success": success,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-        }
-
-        if failure_reason and not success:
-            extra["failure_reason"] = failure_reason
+        extra = _without_none(
+            (
+                ("action", "user_registration"),
+                ("username", username),
+                ("email", email),
+                ("success", success),
+                ("ip_address", ip_address),
+                ("user_agent", user_agent),
+                ("failure_reason", None if success else failure_reason),
+            )
+        )
 
         message = (
             f"User registration {'successful' if success else 'failed'} for: {username}"
@@ -302,17 +467,17 @@ class SecurityLogger:
         path: str, ip_address: str = None, user_agent: str = None, user_id: str = None
     ):
         """Log unauthorized access attempts"""
-        extra = {
-            "action": "unauthorized_access",
-            "path": path,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-        }
-
-        if user_id:
-            extra["user_id"] = user_id
+        extra = _without_none(
+            (
+                ("action", "unauthorized_access"),
+                ("path", path),
+                ("ip_address", ip_address),
+                ("user_agent", user_agent),
+                ("user_id", user_id),
+            )
+        )
 
-        security_logger.warning(f"Unauthorized access attempt to: {path}", extra=extra)
+        security_logger.warning("Unauthorized access attempt to: %s", path, extra=extra)
 
 
 class AccessLogger:
@@ -330,20 +495,19 @@ class AccessLogger:
         request_id: str = None,
     ):
         """Log HTTP requests"""
-        extra = {
-            "method": method,
-            "url": url,
-            "status_code": status_code,
-            "response_time": response_time,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-        }
-
-        if user_id:
-            extra["user_id"] = user_id
-        if request_id:
-            extra["request_id"] = request_id
+        extra = _without_none(
+            (
+                ("method", method),
+                ("url", url),
+                ("status_code", status_code),
+                ("response_time", response_time),
+                ("ip_address", ip_address),
+                ("user_agent", user_agent),
+                ("user_id", user_id),
+                ("request_id", request_id),
+            )
+        )
 
         access_logger.info(
-            f"{method} {url} - {status_code} - {response_time:.4f}s", extra=extra
+            "%s %s - %s - %.4fs", method, url, status_code, response_time, extra=extra
         )
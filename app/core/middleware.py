@@ -2,33 +2,50 @@
 Logging middleware for request/response tracking and performance monitoring
 """
 
+import binascii
+import logging
+import os
 import time
-import uuid
 from typing import Callable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.auth import get_token_subject
 from app.core.logging_config import AccessLogger, get_logger
 
 logger = get_logger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests and responses"""
+class LoggingMiddleware:
+    """
+    Middleware for logging HTTP requests and responses
 
-    def __init__(self, app, exclude_paths: list = None):
-        super().__init__(app)
+    Implemented as plain ASGI (not BaseHTTPMiddleware) so excluded paths and
+    non-HTTP traffic pass straight through, and logged requests avoid the
+    extra task and response wrapping of call_next.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: list = None):
+        self.app = app
         # Paths to exclude from logging (e.g., health checks)
-        self.exclude_paths = exclude_paths or ["/health", "/metrics", "/favicon.ico"]
+        # A tuple lets str.startswith test every prefix in a single C call
+        self.exclude_paths = tuple(
+            exclude_paths or ("/health", "/metrics", "/favicon.ico")
+        )
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip logging for excluded paths before doing any per-request work
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
 
-        # Skip logging for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
+        request = Request(scope)
+
+        # Generate unique request ID (128 random bits, hex encoded)
+        request_id_header = binascii.hexlify(os.urandom(16))
+        request_id = request_id_header.decode()
+        request.state.request_id = request_id
 
         # Extract request information
         client_ip = self._get_client_ip(request)
@@ -37,77 +54,75 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         url = str(request.url)
 
         # Start timing
-        start_time = time.time()
-
-        # Log request start
-        logger.info(
-            f"Request started: {method} {url}",
-            extra={
-                "request_id": request_id,
-                "method": method,
-                "url": url,
-                "ip_address": client_ip,
-                "user_agent": user_agent,
-                "event": "request_start",
-            },
-        )
-
-        try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate response time
-            response_time = time.time() - start_time
-
-            # Get user ID if available (from auth)
-            user_id = getattr(request.state, "user_id", None)
-
-            # Try to extract user ID from token if not already set
-            if not user_id:
-                auth_header = request.headers.get("authorization")
-                if auth_header and auth_header.startswith("Bearer "):
-                    try:
-                        from app.core.auth import verify_token
-                        from fastapi import HTTPException, status
-
-                        token = auth_header.split(" ")[1]
-                        credentials_exception = HTTPException(
-                            status_code=status.HTTP_401_UNAUTHORIZED,
-                            detail="Could not validate credentials",
-                        )
-                        username = verify_token(token, credentials_exception)
-                        if username:
-                            # We have the username, could get user_id from DB but
-                            # that would be expensive in middleware
-                            user_id = username  # Use username as identifier for now
-                    except Exception:
-                        pass  # Invalid token, continue without user_id
-
-            # Log successful response
-            AccessLogger.log_request(
-                method=method,
-                url=url,
-                status_code=response.status_code,
-                response_time=response_time,
-                ip_address=client_ip,
-                user_agent=user_agent,
-                user_id=user_id,
-                request_id=request_id,
+        start_time = time.perf_counter()
+
+        # Log request start (skip building the record when INFO is disabled)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Request started: %s %s",
+                method,
+                url,
+                extra={
+                    "request_id": request_id,
+                    "method": method,
+                    "url": url,
+                    "ip_address": client_ip,
+                    "user_agent": user_agent,
+                    "event": "request_start",
+                },
             )
 
-            # Add custom headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Response-Time"] = f"{response_time:.4f}"
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate response time
+                response_time = time.perf_counter() - start_time
+
+                # Get user ID if available (from auth)
+                user_id = getattr(request.state, "user_id", None)
+
+                # Try to extract user ID from token if not already set
+                if not user_id:
+                    auth_header = request.headers.get("authorization")
+                    if auth_header and auth_header.startswith("Bearer "):
+                        # Served from the token cache when the route already
+                        # authenticated this token; never raises
+                        user_id = get_token_subject(auth_header[7:])
+
+                # Log successful response
+                AccessLogger.log_request(
+                    method=method,
+                    url=url,
+                    status_code=message["status"],
+                    response_time=response_time,
+                    ip_address=client_ip,
+                    user_agent=user_agent,
+                    user_id=user_id,
+                    request_id=request_id,
+                )
+
+                # Add custom headers as raw ASGI byte pairs
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", request_id_header),
+                    (b"x-response-time", b"%.4f" % response_time),
+                ]
+
+            await send(message)
 
-            return response
+        try:
+            # Process request
+            await self.app(scope, receive, send_wrapper)
 
         except Exception as e:
             # Calculate response time even for errors
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
 
             # Log error
             logger.error(
-                f"Request failed: {method} {url} - {str(e)}",
+                "Request failed: %s %s - %s",
+                method,
+                url,
+                e,
                 extra={
                     "request_id": request_id,
                     "method": method,
@@ -126,19 +141,22 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP address from request headers"""
+        headers = request.headers
+
         # Check for forwarded headers (common in load balancers/proxies)
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = headers.get("X-Forwarded-For")
         if forwarded_for:
             # X-Forwarded-For can contain multiple IPs, take the first one
-            return forwarded_for.split(",")[0].strip()
+            return forwarded_for.partition(",")[0].strip()
 
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("X-Real-IP")
         if real_ip:
             return real_ip
 
         # Fallback to direct client IP
-        if request.client:
-            return request.client.host
+        client = request.client
+        if client:
+            return client.host
 
         return "unknown"
 
@@ -151,19 +169,25 @@ class PerformanceLoggingMiddleware(BaseHTTPMiddleware):
         self.slow_request_threshold = slow_request_threshold  # seconds
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         response = await call_next(request)
 
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
 
         # Log slow requests
-        if response_time > self.slow_request_threshold:
+        if response_time > self.slow_request_threshold and logger.isEnabledFor(
+            logging.WARNING
+        ):
+            url = str(request.url)
             logger.warning(
-                f"Slow request detected: {request.method} {request.url} took {response_time:.4f}s",
+                "Slow request detected: %s %s took %.4fs",
+                request.method,
+                url,
+                response_time,
                 extra={
                     "method": request.method,
-                    "url": str(request.url),
+                    "url": url,
                     "response_time": response_time,
                     "status_code": response.status_code,
                     "event": "slow_request",
@@ -0,0 +1,48 @@
+"""
+In-process per-user request rate limiting
+
+Counts each user's requests in fixed windows and answers 429 Too Many
+Requests once a window's budget is spent. Counters live in this process, so
+with several workers each one enforces the limit on its own share of traffic.
+"""
+
+import time
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, status
+
+from app.core.auth import get_current_active_user
+from app.models.models import User
+
+
+class RateLimiter:
+    """Dependency allowing each user max_requests per window_seconds"""
+
+    def __init__(self, max_requests: int, window_seconds: int = 60):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        # Keyed by (user id, window number); stale windows simply expire
+        self._counts = TTLCache(maxsize=100_000, ttl=window_seconds)
+
+    async def __call__(
+        self, current_user: User = Depends(get_current_active_user)
+    ) -> None:
+        if self.max_requests <= 0:
+            return
+
+        now = time.monotonic()
+        window = int(now // self.window_seconds)
+        key = (current_user.id, window)
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+
+        if count > self.max_requests:
+            retry_after = self.window_seconds * (window + 1) - now
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, int(retry_after)))},
+            )
+
+    def reset(self) -> None:
+        """Drop all counters"""
+        self._counts.clear()
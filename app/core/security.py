@@ -0,0 +1,14 @@
+"""
+Constant-time comparison for secrets
+
+== and != stop at the first differing character, so their timing reveals
+how much of a guessed token, secret, or hash matched. Compare those with
+secure_str_eq instead; CI rejects ==/!= on such names in app/.
+"""
+
+import hmac
+
+
+def secure_str_eq(a: str, b: str) -> bool:
+    """Constant-time string comparison for secrets"""
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
@@ -0,0 +1,118 @@
+"""
+In-process cache for serialized task list pages
+
+Clients polling their task list re-request the same pages over and over.
+Each user's pages are kept (as ready-to-send JSON bytes plus headers) for a
+short TTL, and every write to that user's tasks drops all of them, so this
+process never serves a page older than its own last write. Concurrent misses
+for the same page share a single load; a load that overlaps a write is
+returned to its callers but never cached.
+
+Invalidation only reaches the process that handled the write. With several
+workers another one could serve a page older than the user's last write for
+up to the TTL, so the cache is off by default when WEB_CONCURRENCY (the
+worker count uvicorn and gunicorn read) is above 1; setting
+TASK_LIST_CACHE_TTL_SECONDS explicitly accepts that lag.
+"""
+
+import asyncio
+import itertools
+import os
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import uuid
+from cachetools import TTLCache
+
+_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+TASK_LIST_CACHE_TTL_SECONDS = int(
+    os.getenv("TASK_LIST_CACHE_TTL_SECONDS", "15" if _WORKERS <= 1 else "0")
+)
+
+# (skip, limit, cursor) of a list request
+PageKey = Tuple[int, int, Optional[str]]
+# Serialized body and extra response headers
+CachedPage = Tuple[bytes, Optional[Dict[str, str]]]
+
+# One entry per user holding all of that user's cached pages, so invalidation
+# is a single pop; the TTL runs from the first page cached for the user
+_task_list_cache = TTLCache(maxsize=10_000, ttl=TASK_LIST_CACHE_TTL_SECONDS)
+
+# Generation of each user's last write, from one process-wide counter so a
+# value is never reused. A load that started under an older generation may
+# hold pre-write rows, so it is neither cached nor joined by requests arriving
+# after the write. Entries only matter while such a load runs, which the
+# pool and command timeouts keep well under the TTL
+_GENERATION_TTL_SECONDS = 300
+_write_sequence = itertools.count(1)
+_generations = TTLCache(maxsize=100_000, ttl=_GENERATION_TTL_SECONDS)
+
+# Loads in progress, so a burst of identical misses runs one query; a None
+# result means the loading request was cancelled and waiters must retry
+_inflight: Dict[
+    Tuple[uuid.UUID, PageKey, Optional[int]], "asyncio.Future[Optional[CachedPage]]"
+] = {}
+
+
+def get_cached_page(user_id: uuid.UUID, key: PageKey) -> Optional[CachedPage]:
+    """Return a cached page for the user, if any"""
+    pages = _task_list_cache.get(user_id)
+    return pages.get(key) if pages is not None else None
+
+
+def cache_page(user_id: uuid.UUID, key: PageKey, page: CachedPage) -> None:
+    """Remember a serialized page for the user"""
+    pages = _task_list_cache.get(user_id)
+    if pages is None:
+        pages = _task_list_cache[user_id] = {}
+    pages[key] = page
+
+
+async def load_page_once(
+    user_id: uuid.UUID, key: PageKey, loader: Callable[[], Awaitable[CachedPage]]
+) -> CachedPage:
+    """Return a cached page, or run loader once for all concurrent callers"""
+    page = get_cached_page(user_id, key)
+    if page is not None:
+        return page
+
+    generation = _generations.get(user_id)
+    flight_key = (user_id, key, generation)
+    pending = _inflight.get(flight_key)
+    if pending is not None:
+        # shield: a cancelled waiter must not cancel the shared load
+        page = await asyncio.shield(pending)
+        if page is not None:
+            return page
+        # The loading request was cancelled; start (or join) a fresh load
+        return await load_page_once(user_id, key, loader)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[flight_key] = future
+    try:
+        page = await loader()
+    except Exception as e:
+        # Waiters see the same error; mark it retrieved in case there are none
+        future.set_exception(e)
+        future.exception()
+        raise
+    except BaseException:
+        # Only this request was cancelled; waiters retry rather than inherit it
+        future.set_result(None)
+        raise
+    else:
+        if TASK_LIST_CACHE_TTL_SECONDS and _generations.get(user_id) == generation:
+            cache_page(user_id, key, page)
+        future.set_result(page)
+        return page
+    finally:
+        del _inflight[flight_key]
+
+
+def invalidate_user_tasks(user_id: uuid.UUID) -> None:
+    """Drop a user's cached pages; call after any change to their tasks"""
+    _task_list_cache.pop(user_id, None)
+    _generations[user_id] = next(_write_sequence)
+
+
+def clear_task_cache() -> None:
+    """Drop all cached pages"""
+    _task_list_cache.clear()
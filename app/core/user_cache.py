@@ -0,0 +1,50 @@
+"""
+In-process cache for authenticated user lookups
+
+Every authenticated request resolves the token's username to a User row.
+Caching the row for a short TTL removes that database round-trip for
+clients making repeated calls. Entries are plain column dicts, so each hit
+returns a fresh, session-independent User instance. Code writing to a user
+row (registration, password rehash on login) calls invalidate_user after
+committing; the cache is per process, so other workers may keep the old row
+for up to the TTL.
+"""
+
+import os
+from typing import Optional
+from cachetools import TTLCache
+from sqlalchemy import bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.models import User
+
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+# Built once so SQLAlchemy reuses the cached compiled form on every lookup
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+_user_cache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL_SECONDS)
+
+
+async def get_user_cached(db: AsyncSession, username: str) -> Optional[User]:
+    """Get a user by username, querying the database only on a cache miss"""
+    cached = _user_cache.get(username)
+    if cached is not None:
+        return User(**cached)
+
+    result = await db.execute(USER_BY_USERNAME, {"username": username})
+    user = result.scalar_one_or_none()
+    if user is not None:
+        _user_cache[username] = user.model_dump()
+    return user
+
+
+def invalidate_user(username: str) -> None:
+    """Drop a cached user; call after any change to the user's row"""
+    _user_cache.pop(username, None)
+
+
+def clear_user_cache() -> None:
+    """Drop all cached users"""
+    _user_cache.clear()
@@ -1,9 +1,46 @@
+from sqlalchemy import DateTime, Index
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
 from typing import Optional, List
+import os
+import time
 import uuid
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit millisecond timestamp
+    followed by random bits, so new primary keys append to the right edge of
+    the B-tree instead of landing on random pages
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+class utcnow(FunctionElement):
+    """
+    Database-side UTC timestamp; columns are naive UTC (datetime.utcnow), so
+    plain NOW() would be off by the server's timezone offset on PostgreSQL
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"  # UTC on SQLite
+
+
 class User(SQLModel, table=True):
     """
     User model - represents users in our system
@@ -12,14 +49,17 @@ class User(SQLModel, table=True):
 
     __tablename__ = "users"
 
-    id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: Optional[uuid.UUID] = Field(default_factory=uuid7, primary_key=True)
     username: str = Field(max_length=50, unique=True, index=True)
     email: str = Field(max_length=100, unique=True, index=True)
     hashed_password: str = Field(max_length=255)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    # Relationship with tasks
-    tasks: List["Task"] = Relationship(back_populates="owner")
+    # Relationship with tasks; never lazy-loaded (that would be an implicit
+    # query per user, and fails under asyncio anyway) - load it explicitly
+    tasks: List["Task"] = Relationship(
+        back_populates="owner", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class Task(SQLModel, table=True):
@@ -31,17 +71,27 @@ class Task(SQLModel, table=True):
 
     __tablename__ = "tasks"
 
-    id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: Optional[uuid.UUID] = Field(default_factory=uuid7, primary_key=True)
     title: str = Field(max_length=200, index=True)  # Index for search performance
     description: Optional[str] = Field(default=None, max_length=1000)
     state: bool = Field(default=False, index=True)  # Index for filtering by state
-    created_at: datetime = Field(
-        default_factory=datetime.utcnow, index=True
-    )  # Index for ordering
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": utcnow(), "onupdate": utcnow()},
+    )
+
+    # Foreign key to users table (indexed via the composite indexes below)
+    user_id: uuid.UUID = Field(foreign_key="users.id")
+
+    # Relationship with user; never lazy-loaded (see User.tasks)
+    owner: Optional[User] = Relationship(
+        back_populates="tasks", sa_relationship_kwargs={"lazy": "raise"}
+    )
 
-    # Foreign key to users table with index for performance
-    user_id: uuid.UUID = Field(foreign_key="users.id", index=True)
 
-    # Relationship with user
-    owner: Optional[User] = Relationship(back_populates="tasks")
+# Composite indexes for the per-user access paths: listing a user's tasks
+# newest first (and seeking past a keyset cursor) is a single range scan, and
+# state filters stay per user
+Index("ix_tasks_user_created_id", Task.user_id, Task.created_at.desc(), Task.id.desc())
+Index("ix_tasks_user_state", Task.user_id, Task.state)
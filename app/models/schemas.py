@@ -1,243 +1,368 @@
 from pydantic import (
     BaseModel,
+    ConfigDict,
+    StringConstraints,
     field_serializer,
     field_validator,
     model_validator,
-    EmailStr,
 )
 from datetime import datetime
-from typing import Optional, Any, Dict
+from typing import Annotated, Optional, Any, Dict
 import uuid
 import re
+import string
 
+from app.core.security import secure_str_eq
 
-# Base schemas
-class TaskBase(BaseModel):
-    title: str
-    description: Optional[str] = None
+# Validator patterns, compiled once at import
+# (patterns used in StringConstraints run in pydantic-core, so no lookarounds)
+_USERNAME_PATTERN = r"^[a-zA-Z0-9](?:[a-zA-Z0-9_-]*[a-zA-Z0-9])?$"
+_EMAIL_RE = re.compile(
+    r"^(?P<local>[a-zA-Z0-9._%+-]+)@(?P<domain>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})$"
+)
 
+# Password character classes, collected in a single pass by _scan_password
+_PW_UPPER = frozenset(string.ascii_uppercase)
+_PW_LOWER = frozenset(string.ascii_lowercase)
+_PW_SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>')
+_HAS_UPPER, _HAS_LOWER, _HAS_DIGIT, _HAS_SPECIAL = 1, 2, 4, 8
+
+# Validator lookup tables, built once at import
+_RESERVED_USERNAMES = frozenset(
+    {
+        "admin",
+        "administrator",
+        "root",
+        "user",
+        "test",
+        "demo",
+        "guest",
+        "api",
+        "www",
+        "mail",
+        "email",
+        "support",
+        "help",
+        "info",
+        "contact",
+        "null",
+        "undefined",
+        "none",
+        "system",
+        "operator",
+    }
+)
 
-class UserBase(BaseModel):
-    username: str
-    email: str
+_WEAK_PASSWORDS = frozenset(
+    {
+        "password",
+        "password123",
+        "12345678",
+        "qwerty123",
+        "abc123456",
+        "password1",
+        "admin123",
+        "user123",
+        "test123",
+        "demo123",
+    }
+)
 
-    @field_validator("username")
-    @classmethod
-    def validate_username(cls, v):
-        """Comprehensive username validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Username is required and must be a string")
+_SEQUENCES = ("1234", "abcd", "qwer", "asdf", "zxcv")
+
+_STATE_MAP = {
+    "done": "done",
+    "completed": "done",
+    "finished": "done",
+    "complete": "done",
+    "true": "done",
+    "1": "done",
+    "pending": "pending",
+    "todo": "pending",
+    "incomplete": "pending",
+    "open": "pending",
+    "false": "pending",
+    "0": "pending",
+}
+_STATE_ERROR = (
+    f"State must be one of: done, pending. Also accepts: {', '.join(_STATE_MAP)}"
+)
 
-        # Strip whitespace
-        v = v.strip()
+# Task payload fields and the prebuilt type errors for the before-validators
+_TASK_UPDATE_FIELDS = ("title", "description", "state")
+_STRING_NULLS = frozenset({"null", "none", "undefined"})
+_RESERVED_TITLES = _STRING_NULLS
+# Longer text cannot be a reserved word, so the lowercase copy can be skipped
+_RESERVED_WORD_MAX_LEN = max(map(len, _STRING_NULLS))
+_TYPE_NAMES = {
+    int: "a number",
+    float: "a number",
+    bool: "a boolean",
+    list: "a list",
+    dict: "an object",
+}
+_UPDATE_TYPE_ERRORS = {
+    (field, value_type): f"{field.title()} must be a string, not {name}"
+    for field in _TASK_UPDATE_FIELDS
+    for value_type, name in _TYPE_NAMES.items()
+}
+# Creation lets pydantic report lists and objects itself
+_CREATE_TYPE_ERRORS = {
+    (field, value_type): message
+    for (field, value_type), message in _UPDATE_TYPE_ERRORS.items()
+    if field != "state" and value_type in (int, float, bool)
+}
+
+
+def _scan_password(v: str) -> tuple[int, int]:
+    """Return (character-class flags, distinct character count) in one pass"""
+    flags = 0
+    for ch in v:
+        if ch in _PW_UPPER:
+            flags |= _HAS_UPPER
+        elif ch in _PW_LOWER:
+            flags |= _HAS_LOWER
+        elif ch.isdecimal():  # same set as the \d regex class
+            flags |= _HAS_DIGIT
+        elif ch in _PW_SPECIAL:
+            flags |= _HAS_SPECIAL
+    return flags, len(set(v))
+
+
+def _has_two_distinct(v: str, ignore: str = "") -> bool:
+    """True once a second distinct character (other than ignore) is seen"""
+    first = None
+    for ch in v:
+        if ch == ignore:
+            continue
+        if first is None:
+            first = ch
+        elif ch != first:
+            return True
+    return False
+
+
+def _has_word_or_space(v: str) -> bool:
+    """True at the first word or whitespace character (same classes as \\w and \\s)"""
+    for ch in v:
+        if ch.isalnum() or ch == "_" or ch.isspace():
+            return True
+    return False
+
+
+# Length, charset and case rules run natively in pydantic-core; the _check_*
+# helpers below only cover the rules constraints cannot express
+Username = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        to_lower=True,  # Store usernames in lowercase
+        min_length=3,
+        max_length=50,
+        pattern=_USERNAME_PATTERN,
+    ),
+]
+Email = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True, to_lower=True, max_length=100, pattern=_EMAIL_RE.pattern
+    ),
+]
+Password = Annotated[str, StringConstraints(min_length=8, max_length=128)]
+Title = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=3, max_length=200)
+]
+Description = Annotated[str, StringConstraints(strip_whitespace=True, max_length=1000)]
+
+
+def _check_username(v: str, check_repetition: bool = False) -> str:
+    """Reject reserved (and optionally repetitive) usernames"""
+    # Check for reserved usernames
+    if v in _RESERVED_USERNAMES:
+        raise ValueError(f"Username '{v}' is reserved and cannot be used")
+
+    # Check for excessive repetition
+    if check_repetition and len(v) > 3 and not _has_two_distinct(v):
+        raise ValueError("Username cannot be repetitive characters")
+
+    return v
+
+
+def _check_password(v: str, strict: bool = False) -> str:
+    """Validate password strength; strict also rejects keyboard sequences"""
+    flags, distinct = _scan_password(v)
+
+    # Check for at least one uppercase letter
+    if not flags & _HAS_UPPER:
+        raise ValueError("Password must contain at least one uppercase letter")
+
+    # Check for at least one lowercase letter
+    if not flags & _HAS_LOWER:
+        raise ValueError("Password must contain at least one lowercase letter")
+
+    # Check for at least one digit
+    if not flags & _HAS_DIGIT:
+        raise ValueError("Password must contain at least one number")
+
+    # Check for at least one special character
+    if not flags & _HAS_SPECIAL:
+        raise ValueError(
+            'Password must contain at least one special character (!@#$%^&*(),.?":{}|<>)'
+            if strict
+            else "Password must contain at least one special character"
+        )
+
+    # Check for common weak passwords
+    lowered = v.lower()
+    if lowered in _WEAK_PASSWORDS:
+        raise ValueError("Password is too common and weak")
+
+    # Check for repetitive patterns
+    if distinct < 4:
+        raise ValueError("Password cannot be too repetitive")
+
+    # Check for sequential characters
+    if strict:
+        for seq in _SEQUENCES:
+            if seq in lowered:
+                raise ValueError("Password cannot contain common sequential patterns")
 
-        if len(v) == 0:
-            raise ValueError("Username cannot be empty")
+    return v
 
-        if len(v) < 3:
-            raise ValueError("Username must be at least 3 characters long")
 
-        if len(v) > 50:
-            raise ValueError("Username cannot exceed 50 characters")
+def _check_email(v: str, check_parts: bool = False) -> str:
+    """Check what the email pattern cannot; check_parts adds local/domain limits"""
+    # Check for common mistakes
+    if ".." in v:
+        raise ValueError("Email cannot contain consecutive dots")
 
-        # Check for valid characters (alphanumeric, underscore, hyphen)
-        if not re.match(r"^[a-zA-Z0-9_-]+$", v):
-            raise ValueError(
-                "Username can only contain letters, numbers, underscores, and hyphens"
-            )
+    # The pattern already rules out a leading "@" and a trailing "." or "@"
+    if v[0] == ".":
+        raise ValueError("Email cannot start with dot or @ symbol")
 
-        # Must start with letter or number
-        if not re.match(r"^[a-zA-Z0-9]", v):
-            raise ValueError("Username must start with a letter or number")
-
-        # Cannot end with special characters
-        if v.endswith(("_", "-")):
-            raise ValueError("Username cannot end with underscore or hyphen")
-
-        # Check for reserved usernames
-        reserved_usernames = {
-            "admin",
-            "administrator",
-            "root",
-            "user",
-            "test",
-            "demo",
-            "guest",
-            "api",
-            "www",
-            "mail",
-            "email",
-            "support",
-            "help",
-            "info",
-            "contact",
-            "null",
-            "undefined",
-            "none",
-            "system",
-            "operator",
-        }
-
-        if v.lower() in reserved_usernames:
-            raise ValueError(f"Username '{v}' is reserved and cannot be used")
-
-        # Check for excessive repetition
-        if len(set(v)) < 2 and len(v) > 3:
-            raise ValueError("Username cannot be repetitive characters")
-
-        return v.lower()  # Store usernames in lowercase
+    if check_parts:
+        local, _, domain = v.partition("@")
+        if len(local) > 64:
+            raise ValueError("Email local part cannot exceed 64 characters")
 
-    @field_validator("email")
-    @classmethod
-    def validate_email(cls, v):
-        """Comprehensive email validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Email is required and must be a string")
+        # The domain always ends in letters, so only its start can be a hyphen
+        if domain[0] == "-":
+            raise ValueError("Email domain cannot start or end with hyphen")
 
-        # Strip whitespace
-        v = v.strip().lower()
+    return v
 
-        if len(v) == 0:
-            raise ValueError("Email cannot be empty")
 
-        if len(v) > 100:
-            raise ValueError("Email cannot exceed 100 characters")
+def _check_title(v: str) -> str:
+    """Content rules for an already stripped, length-checked title"""
+    # Check for only special characters
+    if not _has_word_or_space(v):
+        raise ValueError("Title cannot contain only special characters")
 
-        # Basic email regex pattern
-        email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        if not re.match(email_pattern, v):
-            raise ValueError("Invalid email format")
+    # Check for suspicious patterns
+    if len(v) <= _RESERVED_WORD_MAX_LEN and v.lower() in _RESERVED_TITLES:
+        raise ValueError("Title cannot be a reserved word")
 
-        # Check for common mistakes
-        if ".." in v:
-            raise ValueError("Email cannot contain consecutive dots")
+    # Check for excessive repetition
+    if len(v) > 5 and not _has_two_distinct(v, ignore=" "):
+        raise ValueError("Title cannot be repetitive characters")
 
-        if v.startswith(".") or v.startswith("@"):
-            raise ValueError("Email cannot start with dot or @ symbol")
+    return v
 
-        if v.endswith(".") or v.endswith("@"):
-            raise ValueError("Email cannot end with dot or @ symbol")
 
-        # Check domain part
-        if "@" in v:
-            local, domain = v.split("@", 1)
+def _check_description(v: Optional[str], check_reserved: bool = False):
+    """Content rules for a stripped description; empty becomes None"""
+    if not v:
+        return None  # Empty description is OK, convert to None
 
-            if len(local) == 0:
-                raise ValueError("Email local part cannot be empty")
+    # Check for only special characters
+    if not _has_word_or_space(v):
+        raise ValueError("Description cannot contain only special characters")
 
-            if len(local) > 64:
-                raise ValueError("Email local part cannot exceed 64 characters")
+    # Check for suspicious patterns
+    if (
+        check_reserved
+        and len(v) <= _RESERVED_WORD_MAX_LEN
+        and v.lower() in _STRING_NULLS
+    ):
+        raise ValueError("Description cannot be a reserved word")
 
-            if len(domain) == 0:
-                raise ValueError("Email domain cannot be empty")
+    return v
 
-            if len(domain) > 253:
-                raise ValueError("Email domain cannot exceed 253 characters")
 
-            # Check for valid domain
-            if not re.match(r"^[a-zA-Z0-9.-]+$", domain):
-                raise ValueError("Email domain contains invalid characters")
+# Base schemas
+class TaskBase(BaseModel):
+    title: str
+    description: Optional[str] = None
 
-            if domain.startswith("-") or domain.endswith("-"):
-                raise ValueError("Email domain cannot start or end with hyphen")
 
-            # Must have at least one dot in domain
-            if "." not in domain:
-                raise ValueError("Email domain must contain at least one dot")
+class UserBase(BaseModel):
+    username: Username
+    email: Email
 
-        return v
+    @field_validator("username")
+    @classmethod
+    def validate_username(cls, v):
+        """Comprehensive username validation"""
+        return _check_username(v, check_repetition=True)
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, v):
+        """Comprehensive email validation"""
+        return _check_email(v, check_parts=True)
 
 
 # Request schemas (what we receive from the client)
 class TaskCreate(TaskBase):
     """Schema for creating a new task"""
 
+    title: Title
+    description: Optional[Description] = None
+
     @field_validator("title")
     @classmethod
     def validate_title(cls, v):
         """Comprehensive title validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Title is required and must be a string")
-
-        # Strip whitespace
-        v = v.strip()
-
-        if len(v) == 0:
-            raise ValueError("Title cannot be empty or only whitespace")
-
-        if len(v) < 3:
-            raise ValueError("Title must be at least 3 characters long")
-
-        if len(v) > 200:
-            raise ValueError("Title cannot exceed 200 characters")
-
-        # Check for only special characters
-        if re.match(r"^[^\w\s]+$", v):
-            raise ValueError("Title cannot contain only special characters")
-
-        # Check for suspicious patterns
-        if v.lower() in ["null", "undefined", "none", ""]:
-            raise ValueError("Title cannot be a reserved word")
-
-        # Check for excessive repetition
-        if len(set(v.replace(" ", ""))) < 2 and len(v) > 5:
-            raise ValueError("Title cannot be repetitive characters")
-
-        return v
+        return _check_title(v)
 
     @field_validator("description")
     @classmethod
     def validate_description(cls, v):
         """Comprehensive description validation"""
-        if v is not None:
-            if not isinstance(v, str):
-                raise ValueError("Description must be a string")
-
-            # Strip whitespace
-            v = v.strip()
-
-            if len(v) == 0:
-                return None  # Empty description is OK, convert to None
-
-            if len(v) > 1000:
-                raise ValueError("Description cannot exceed 1000 characters")
-
-            # Check for only special characters
-            if re.match(r"^[^\w\s]+$", v):
-                raise ValueError("Description cannot contain only special characters")
-
-        return v if v else None
+        return _check_description(v)
 
     @model_validator(mode="before")
     @classmethod
     def validate_input_data(cls, data: Any) -> Any:
         """Pre-process and validate input data structure for task creation"""
         if isinstance(data, dict):
-            # Handle null/None values that might come as strings
-            for key, value in list(data.items()):
-                if isinstance(value, str):
+            # Normalize values in one pass, tracking whether any are left set
+            # (only values are reassigned, so iterating items() is safe)
+            all_none = True
+            for key, value in data.items():
+                value_type = type(value)
+                if value_type is str:
                     # Convert string nulls to actual None
-                    if value.lower() in ["null", "none", "undefined"]:
+                    if value.lower() in _STRING_NULLS:
                         data[key] = None
+                        continue
                     # Strip whitespace from all string values
-                    elif value.strip() != value:
-                        data[key] = value.strip()
-                # Handle numeric values that should be strings
-                elif isinstance(value, (int, float)) and key in [
-                    "title",
-                    "description",
-                ]:
-                    raise ValueError(f"{key.title()} must be a string, not a number")
-                # Handle boolean values that should be strings
-                elif isinstance(value, bool) and key in ["title", "description"]:
-                    raise ValueError(f"{key.title()} must be a string, not a boolean")
+                    stripped = value.strip()
+                    if stripped != value:
+                        data[key] = stripped
+                elif value is None:
+                    continue
+                # Handle numeric/boolean values that should be strings
+                elif (key, value_type) in _CREATE_TYPE_ERRORS:
+                    raise ValueError(_CREATE_TYPE_ERRORS[key, value_type])
+                all_none = False
 
             # Check for required fields
-            if "title" not in data or data["title"] is None:
+            if data.get("title") is None:
                 raise ValueError("Title is required for task creation")
 
             # Reject completely empty requests
-            if not data or all(v is None for v in data.values()):
+            if all_none:
                 raise ValueError("Request cannot be empty")
 
         return data
@@ -246,70 +371,24 @@ class TaskCreate(TaskBase):
 class TaskUpdate(BaseModel):
     """Schema for updating a task"""
 
-    title: Optional[str] = None
-    description: Optional[str] = None
+    # Forbid extra fields not defined in the model; strip strings in pydantic-core
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+
+    title: Optional[Title] = None
+    description: Optional[Description] = None
     state: Optional[str] = None  # Accept "done" or "pending"
 
     @field_validator("title")
     @classmethod
     def validate_title(cls, v):
         """Enhanced title validation for updates"""
-        if v is not None:
-            if not isinstance(v, str):
-                raise ValueError("Title must be a string")
-
-            # Strip whitespace
-            v = v.strip()
-
-            if len(v) == 0:
-                raise ValueError("Title cannot be empty or only whitespace")
-
-            if len(v) < 3:
-                raise ValueError("Title must be at least 3 characters long")
-
-            if len(v) > 200:
-                raise ValueError("Title cannot exceed 200 characters")
-
-            # Check for only special characters
-            if re.match(r"^[^\w\s]+$", v):
-                raise ValueError("Title cannot contain only special characters")
-
-            # Check for suspicious patterns
-            if v.lower() in ["null", "undefined", "none", ""]:
-                raise ValueError("Title cannot be a reserved word")
-
-            # Check for excessive repetition
-            if len(set(v.replace(" ", ""))) < 2 and len(v) > 5:
-                raise ValueError("Title cannot be repetitive characters")
-
-        return v if v else None
+        return _check_title(v) if v is not None else None
 
     @field_validator("description")
     @classmethod
     def validate_description(cls, v):
         """Enhanced description validation for updates"""
-        if v is not None:
-            if not isinstance(v, str):
-                raise ValueError("Description must be a string")
-
-            # Strip whitespace
-            v = v.strip()
-
-            if len(v) == 0:
-                return None  # Empty description becomes None
-
-            if len(v) > 1000:
-                raise ValueError("Description cannot exceed 1000 characters")
-
-            # Check for only special characters
-            if re.match(r"^[^\w\s]+$", v):
-                raise ValueError("Description cannot contain only special characters")
-
-            # Check for suspicious patterns
-            if v.lower() in ["null", "undefined", "none"]:
-                raise ValueError("Description cannot be a reserved word")
-
-        return v if v else None
+        return _check_description(v, check_reserved=True)
 
     @field_validator("state")
     @classmethod
@@ -319,36 +398,18 @@ class TaskUpdate(BaseModel):
             if not isinstance(v, str):
                 raise ValueError("State must be a string")
 
-            # Normalize case and strip whitespace
-            v = v.strip().lower()
+            # Normalize case (whitespace is stripped by str_strip_whitespace)
+            v = v.lower()
 
             if v == "":
                 raise ValueError("State cannot be empty")
 
             # Accept various forms and normalize them
-            valid_states = {
-                "done": "done",
-                "completed": "done",
-                "finished": "done",
-                "complete": "done",
-                "true": "done",
-                "1": "done",
-                "pending": "pending",
-                "todo": "pending",
-                "incomplete": "pending",
-                "open": "pending",
-                "false": "pending",
-                "0": "pending",
-            }
-
-            if v not in valid_states:
-                valid_options = list(set(valid_states.values()))
-                raise ValueError(
-                    f'State must be one of: {", ".join(valid_options)}. '
-                    f'Also accepts: {", ".join(valid_states.keys())}'
-                )
-
-            return valid_states[v]
+            state = _STATE_MAP.get(v)
+            if state is None:
+                raise ValueError(_STATE_ERROR)
+
+            return state
 
         return v
 
@@ -357,55 +418,29 @@ class TaskUpdate(BaseModel):
     def validate_fields(cls, data: Any) -> Any:
         """Enhanced validation for allowed fields and data types"""
         if isinstance(data, dict):
-            # Check for allowed fields
-            allowed_fields = {"title", "description", "state"}
-            provided_fields = set(data.keys())
-            invalid_fields = provided_fields - allowed_fields
-
-            if invalid_fields:
-                raise ValueError(
-                    f"Invalid field(s): {', '.join(invalid_fields)}. "
-                    f"Allowed fields are: {', '.join(allowed_fields)}"
-                )
-
-            # Handle null/None values that might come as strings
-            for key, value in list(data.items()):
-                if isinstance(value, str):
-                    # Convert string nulls to actual None (but preserve empty strings for validation)
-                    if value.lower() in ["null", "none", "undefined"]:
-                        data[key] = None
-                # Handle unexpected data types
-                elif isinstance(value, (int, float)) and key in [
-                    "title",
-                    "description",
-                    "state",
-                ]:
-                    raise ValueError(f"{key.title()} must be a string, not a number")
-                elif isinstance(value, bool) and key in [
-                    "title",
-                    "description",
-                    "state",
-                ]:
-                    raise ValueError(f"{key.title()} must be a string, not a boolean")
-                elif isinstance(value, list) and key in [
-                    "title",
-                    "description",
-                    "state",
-                ]:
-                    raise ValueError(f"{key.title()} must be a string, not a list")
-                elif isinstance(value, dict) and key in [
-                    "title",
-                    "description",
-                    "state",
-                ]:
-                    raise ValueError(f"{key.title()} must be a string, not an object")
-
+            # Unknown fields are rejected by extra="forbid" in pydantic-core
             # Check for completely empty request
             if not data:
                 raise ValueError("Update request cannot be completely empty")
 
+            # Normalize values in one pass, tracking whether any are left set
+            all_none = True
+            for key, value in data.items():
+                value_type = type(value)
+                if value_type is str:
+                    # Convert string nulls to actual None (but preserve empty strings for validation)
+                    if value.lower() in _STRING_NULLS:
+                        data[key] = None
+                        continue
+                elif value is None:
+                    continue
+                # Handle unexpected data types
+                elif (key, value_type) in _UPDATE_TYPE_ERRORS:
+                    raise ValueError(_UPDATE_TYPE_ERRORS[key, value_type])
+                all_none = False
+
             # Check if all provided values are None
-            if all(v is None for v in data.values()):
+            if all_none:
                 raise ValueError("Cannot update all fields to null/empty")
 
         return data
@@ -413,99 +448,38 @@ class TaskUpdate(BaseModel):
     @model_validator(mode="after")
     def validate_at_least_one_field(self) -> "TaskUpdate":
         """Ensure at least one field is provided for update"""
-        if all(
-            getattr(self, field) is None for field in ["title", "description", "state"]
-        ):
+        if all(getattr(self, field) is None for field in _TASK_UPDATE_FIELDS):
             raise ValueError(
                 "At least one field (title, description, or state) must be provided for update"
             )
         return self
 
-    class Config:
-        """Pydantic configuration"""
-
-        extra = "forbid"  # Forbid extra fields not defined in the model
-
 
 class UserCreate(UserBase):
     """Schema for creating a new user"""
 
-    password: str
+    password: Password
 
     @field_validator("password")
     @classmethod
     def validate_password(cls, v):
         """Comprehensive password validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Password is required and must be a string")
-
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-
-        if len(v) > 128:
-            raise ValueError("Password cannot exceed 128 characters")
-
-        # Check for at least one uppercase letter
-        if not re.search(r"[A-Z]", v):
-            raise ValueError("Password must contain at least one uppercase letter")
-
-        # Check for at least one lowercase letter
-        if not re.search(r"[a-z]", v):
-            raise ValueError("Password must contain at least one lowercase letter")
-
-        # Check for at least one digit
-        if not re.search(r"\d", v):
-            raise ValueError("Password must contain at least one number")
-
-        # Check for at least one special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
-            raise ValueError(
-                'Password must contain at least one special character (!@#$%^&*(),.?":{}|<>)'
-            )
-
-        # Check for common weak passwords
-        weak_passwords = {
-            "password",
-            "password123",
-            "12345678",
-            "qwerty123",
-            "abc123456",
-            "password1",
-            "admin123",
-            "user123",
-            "test123",
-            "demo123",
-        }
-
-        if v.lower() in weak_passwords:
-            raise ValueError("Password is too common and weak")
-
-        # Check for repetitive patterns
-        if len(set(v)) < 4:
-            raise ValueError("Password cannot be too repetitive")
-
-        # Check for sequential characters
-        sequences = ["1234", "abcd", "qwer", "asdf", "zxcv"]
-        for seq in sequences:
-            if seq in v.lower():
-                raise ValueError("Password cannot contain common sequential patterns")
-
-        return v
+        return _check_password(v, strict=True)
 
 
 # Response schemas (what we send back to the client)
 class Task(TaskBase):
     """Schema for task responses"""
 
+    # This allows Pydantic to work with SQLAlchemy models
+    model_config = ConfigDict(from_attributes=True)
+
     id: uuid.UUID
     state: bool  # Internal field (boolean from database)
     created_at: datetime
     updated_at: datetime
     user_id: uuid.UUID
 
-    class Config:
-        from_attributes = True  # This allows Pydantic to work with SQLAlchemy models
-
     @field_serializer("state")
     def serialize_state(self, state: bool) -> str:
         """Convert boolean state to user-friendly string"""
@@ -515,23 +489,21 @@ class Task(TaskBase):
 class User(UserBase):
     """Schema for user responses (with tasks)"""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: uuid.UUID
     created_at: datetime
     tasks: list[Task] = []
 
-    class Config:
-        from_attributes = True
-
 
 class UserSimple(UserBase):
     """Schema for simple user responses (without tasks)"""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: uuid.UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class TaskResponse(Task):
     """Extended task response with owner information"""
@@ -556,194 +528,44 @@ class TokenData(BaseModel):
 class UserLogin(BaseModel):
     """User login credentials"""
 
-    username: str
-    password: str
-
-    @field_validator("username")
-    @classmethod
-    def validate_username(cls, v):
-        """Login username validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Username is required")
-
-        v = v.strip()
-        if len(v) == 0:
-            raise ValueError("Username cannot be empty")
-
-        if len(v) > 50:
-            raise ValueError("Username too long")
-
-        return v.lower()
-
-    @field_validator("password")
-    @classmethod
-    def validate_password(cls, v):
-        """Login password validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Password is required")
-
-        if len(v) == 0:
-            raise ValueError("Password cannot be empty")
-
-        if len(v) > 128:
-            raise ValueError("Password too long")
-
-        return v
+    username: Annotated[
+        str,
+        StringConstraints(
+            strip_whitespace=True, to_lower=True, min_length=1, max_length=50
+        ),
+    ]
+    password: Annotated[str, StringConstraints(min_length=1, max_length=128)]
 
 
 class UserRegister(BaseModel):
     """User registration data"""
 
-    username: str
-    email: str
-    password: str
-    confirm_password: str
+    username: Username
+    email: Email
+    password: Password
+    confirm_password: Annotated[str, StringConstraints(min_length=1)]
 
     @field_validator("username")
     @classmethod
     def validate_username(cls, v):
         """Registration username validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Username is required and must be a string")
-
-        v = v.strip()
-
-        if len(v) == 0:
-            raise ValueError("Username cannot be empty")
-
-        if len(v) < 3:
-            raise ValueError("Username must be at least 3 characters long")
-
-        if len(v) > 50:
-            raise ValueError("Username cannot exceed 50 characters")
-
-        if not re.match(r"^[a-zA-Z0-9_-]+$", v):
-            raise ValueError(
-                "Username can only contain letters, numbers, underscores, and hyphens"
-            )
-
-        if not re.match(r"^[a-zA-Z0-9]", v):
-            raise ValueError("Username must start with a letter or number")
-
-        if v.endswith(("_", "-")):
-            raise ValueError("Username cannot end with underscore or hyphen")
-
-        reserved_usernames = {
-            "admin",
-            "administrator",
-            "root",
-            "user",
-            "test",
-            "demo",
-            "guest",
-            "api",
-            "www",
-            "mail",
-            "email",
-            "support",
-            "help",
-            "info",
-            "contact",
-            "null",
-            "undefined",
-            "none",
-            "system",
-            "operator",
-        }
-
-        if v.lower() in reserved_usernames:
-            raise ValueError(f"Username '{v}' is reserved and cannot be used")
-
-        return v.lower()
+        return _check_username(v)
 
     @field_validator("email")
     @classmethod
     def validate_email(cls, v):
         """Registration email validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Email is required and must be a string")
-
-        v = v.strip().lower()
-
-        if len(v) == 0:
-            raise ValueError("Email cannot be empty")
-
-        if len(v) > 100:
-            raise ValueError("Email cannot exceed 100 characters")
-
-        email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        if not re.match(email_pattern, v):
-            raise ValueError("Invalid email format")
-
-        if ".." in v:
-            raise ValueError("Email cannot contain consecutive dots")
-
-        if v.startswith(".") or v.startswith("@"):
-            raise ValueError("Email cannot start with dot or @ symbol")
-
-        if v.endswith(".") or v.endswith("@"):
-            raise ValueError("Email cannot end with dot or @ symbol")
-
-        return v
+        return _check_email(v)
 
     @field_validator("password")
     @classmethod
     def validate_password(cls, v):
         """Registration password validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Password is required and must be a string")
-
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-
-        if len(v) > 128:
-            raise ValueError("Password cannot exceed 128 characters")
-
-        if not re.search(r"[A-Z]", v):
-            raise ValueError("Password must contain at least one uppercase letter")
-
-        if not re.search(r"[a-z]", v):
-            raise ValueError("Password must contain at least one lowercase letter")
-
-        if not re.search(r"\d", v):
-            raise ValueError("Password must contain at least one number")
-
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
-            raise ValueError("Password must contain at least one special character")
-
-        weak_passwords = {
-            "password",
-            "password123",
-            "12345678",
-            "qwerty123",
-            "abc123456",
-            "password1",
-            "admin123",
-            "user123",
-            "test123",
-            "demo123",
-        }
-
-        if v.lower() in weak_passwords:
-            raise ValueError("Password is too common and weak")
-
-        if len(set(v)) < 4:
-            raise ValueError("Password cannot be too repetitive")
-
-        return v
-
-    @field_validator("confirm_password")
-    @classmethod
-    def validate_confirm_password(cls, v):
-        """Confirm password validation"""
-        if not v or not isinstance(v, str):
-            raise ValueError("Password confirmation is required")
-
-        return v
+        return _check_password(v)
 
     @model_validator(mode="after")
     def validate_passwords_match(self) -> "UserRegister":
         """Ensure password and confirm_password match"""
-        if self.password != self.confirm_password:
+        if not secure_str_eq(self.password, self.confirm_password):
             raise ValueError("Password and confirmation password do not match")
         return self
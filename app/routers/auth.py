@@ -2,21 +2,31 @@
 Async authentication router for user registration, login, and profile management
 """
 
-from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    status,
+    Request,
+    Response,
+)
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.core.database import get_db
+from app.core.etag import etag_matches, not_modified, weak_etag
 from app.core.auth import (
     authenticate_user,
     create_access_token,
     get_current_active_user,
-    get_password_hash,
-    ACCESS_TOKEN_EXPIRE_MINUTES,
+    get_password_hash_async,
 )
-from app.models.models import User
+from app.core.user_cache import invalidate_user
+from app.models.models import Task, User
 from app.models.schemas import Token, UserRegister, User as UserResponse, UserSimple
 from app.core.logging_config import SecurityLogger, AuditLogger, get_logger
 
@@ -33,7 +43,10 @@ router = APIRouter(
     "/register", response_model=UserSimple, status_code=status.HTTP_201_CREATED
 )
 async def register_user(
-    user_data: UserRegister, request: Request, db: AsyncSession = Depends(get_db)
+    user_data: UserRegister,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Register a new user (async)
@@ -46,32 +59,30 @@ async def register_user(
     user_agent = request.headers.get("user-agent", "unknown")
 
     try:
-        # Check if username already exists
+        # Check username and email uniqueness in a single round-trip; only a
+        # username-match flag per colliding row is fetched (at most two rows
+        # thanks to the unique constraints)
         result = await db.execute(
-            select(User).where(User.username == user_data.username)
-        )
-        existing_user = result.scalar_one_or_none()
-
-        if existing_user:
-            # Log failed registration attempt
-            SecurityLogger.log_registration(
-                username=user_data.username,
-                email=user_data.email,
-                success=False,
-                ip_address=client_ip,
-                user_agent=user_agent,
-                failure_reason="Username already exists",
-            )
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already registered",
+            select(User.username == user_data.username)
+            .where(
+                or_(
+                    User.username == user_data.username,
+                    User.email == user_data.email,
+                )
             )
+            .limit(2)
+        )
+        conflicts = result.scalars().all()
 
-        # Check if email already exists
-        result = await db.execute(select(User).where(User.email == user_data.email))
-        existing_email = result.scalar_one_or_none()
+        if conflicts:
+            # Username collisions take precedence over email collisions
+            if any(conflicts):
+                failure_reason = "Username already exists"
+                detail = "Username already registered"
+            else:
+                failure_reason = "Email already exists"
+                detail = "Email already registered"
 
-        if existing_email:
             # Log failed registration attempt
             SecurityLogger.log_registration(
                 username=user_data.username,
@@ -79,15 +90,15 @@ async def register_user(
                 success=False,
                 ip_address=client_ip,
                 user_agent=user_agent,
-                failure_reason="Email already exists",
+                failure_reason=failure_reason,
             )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
+                detail=detail,
             )
 
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         db_user = User(
             username=user_data.username,
             email=user_data.email,
@@ -95,11 +106,14 @@ async def register_user(
         )
 
         db.add(db_user)
+        # Every column is filled in Python (ids, timestamps) and the session
+        # keeps attributes loaded after commit, so no refresh SELECT is needed
         await db.commit()
-        await db.refresh(db_user)
+        invalidate_user(db_user.username)
 
-        # Log successful registration
-        SecurityLogger.log_registration(
+        # Log successful registration once the response has been sent
+        background_tasks.add_task(
+            SecurityLogger.log_registration,
             username=user_data.username,
             email=user_data.email,
             success=True,
@@ -108,7 +122,8 @@ async def register_user(
         )
 
         # Log audit event
-        AuditLogger.log_user_action(
+        background_tasks.add_task(
+            AuditLogger.log_user_action,
             user_id=str(db_user.id),
             action="user_registered",
             resource="user",
@@ -117,7 +132,7 @@ async def register_user(
             user_agent=user_agent,
         )
 
-        logger.info(f"New user registered: {user_data.username}")
+        logger.info("New user registered: %s", user_data.username)
         return db_user
 
     except HTTPException:
@@ -126,7 +141,9 @@ async def register_user(
     except Exception as e:
         # Log unexpected errors
         logger.error(
-            f"Unexpected error during user registration for {user_data.username}: {str(e)}",
+            "Unexpected error during user registration for %s: %s",
+            user_data.username,
+            e,
             extra={
                 "username": user_data.username,
                 "email": user_data.email,
@@ -155,6 +172,7 @@ async def register_user(
 @router.post("/login", response_model=Token)
 async def login_user(
     request: Request,
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
@@ -179,7 +197,7 @@ async def login_user(
                 failure_reason="Invalid credentials",
             )
 
-            logger.warning(f"Failed login attempt for user: {form_data.username}")
+            logger.warning("Failed login attempt for user: %s", form_data.username)
 
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -187,13 +205,12 @@ async def login_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
-        )
+        # Default expiry is ACCESS_TOKEN_EXPIRE_MINUTES
+        access_token = create_access_token(data={"sub": user.username})
 
-        # Log successful login
-        SecurityLogger.log_login_attempt(
+        # Log successful login once the response has been sent
+        background_tasks.add_task(
+            SecurityLogger.log_login_attempt,
             username=form_data.username,
             success=True,
             ip_address=client_ip,
@@ -201,7 +218,8 @@ async def login_user(
         )
 
         # Log audit event
-        AuditLogger.log_user_action(
+        background_tasks.add_task(
+            AuditLogger.log_user_action,
             user_id=str(user.id),
             action="user_login",
             resource="auth",
@@ -209,7 +227,7 @@ async def login_user(
             user_agent=user_agent,
         )
 
-        logger.info(f"User logged in successfully: {form_data.username}")
+        logger.info("User logged in successfully: %s", form_data.username)
 
         return {"access_token": access_token, "token_type": "bearer"}
 
@@ -219,7 +237,9 @@ async def login_user(
     except Exception as e:
         # Log unexpected errors during login
         logger.error(
-            f"Unexpected error during login for {form_data.username}: {str(e)}",
+            "Unexpected error during login for %s: %s",
+            form_data.username,
+            e,
             extra={
                 "username": form_data.username,
                 "ip_address": client_ip,
@@ -244,29 +264,38 @@ async def login_user(
 
 
 @router.get("/me", response_model=UserSimple)
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+):
     """
     Get current user profile (async)
 
-    Requires authentication token
+    Requires authentication token. Supports If-None-Match: an unchanged
+    profile is answered with 304 Not Modified.
     """
+    # Profiles cannot be edited, so id and creation time identify the version
+    etag = weak_etag(current_user.id, current_user.created_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
     return current_user
 
 
-@router.get("/me/tasks")
+@router.get("/me/tasks", response_model=None)
 async def read_user_tasks(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
-):
+) -> ORJSONResponse:
     """
     Get current user's tasks (async)
 
     Requires authentication token
     """
-    from app.models.schemas import Task as TaskResponse
-    from app.models.models import Task
-    from typing import List
-
-    result = await db.execute(select(Task).where(Task.user_id == current_user.id))
-    tasks = result.scalars().all()
-    return tasks
+    # Plain column rows dumped by orjson: no ORM objects, no jsonable_encoder
+    result = await db.execute(
+        select(Task.__table__).where(Task.user_id == current_user.id)
+    )
+    return ORJSONResponse([dict(row) for row in result.mappings()])
@@ -1,17 +1,152 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    status,
+    Request,
+    Response,
+)
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, delete, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import base64
+import os
 import uuid
 
 from app.core.database import get_db
-from app.core.auth import get_current_active_user
-from app.models.models import Task, User
+from app.core.auth import RequestContext, get_current_active_user, get_request_context
+from app.core.etag import etag_matches, not_modified, weak_etag
+from app.core.rate_limit import RateLimiter
+from app.core.task_cache import CachedPage, invalidate_user_tasks, load_page_once
+from app.models.models import Task, User, utcnow
 from app.models.schemas import TaskCreate, TaskUpdate, Task as TaskResponse
 from app.core.logging_config import AuditLogger, get_logger
 
 logger = get_logger(__name__)
 
+# Columns backing the task response schema; reads select just these so
+# rows skip ORM instance construction and identity-map bookkeeping
+_TASK_READ_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.state,
+    Task.created_at,
+    Task.updated_at,
+    Task.user_id,
+)
+
+# Per-task statements are built once at import; each request only binds
+# task_id/owner_id, so SQLAlchemy's compiled cache is hit without rebuilding
+# the statement tree
+_OWNED_TASK = (Task.id == bindparam("task_id"), Task.user_id == bindparam("owner_id"))
+_SELECT_OWNED_TASK = select(*_TASK_READ_COLUMNS).where(*_OWNED_TASK)
+_DELETE_OWNED_TASK = (
+    delete(Task)
+    .where(*_OWNED_TASK)
+    .returning(Task.title, Task.description, Task.state)
+    .execution_options(synchronize_session=False)
+)
+
+# Columns whose old and new values go into the task_updated audit event. The
+# owned row is read and locked (FOR NO KEY UPDATE on PostgreSQL) for the update
+_AUDITED_COLUMNS = (Task.title, Task.description, Task.state)
+_LOCK_OWNED_TASK = (
+    select(Task.id, *_AUDITED_COLUMNS)
+    .where(*_OWNED_TASK)
+    .with_for_update(key_share=True)
+)
+_OLD_TASK = _LOCK_OWNED_TASK.cte("old")
+_OLD_TASK_COLUMNS = tuple(
+    _OLD_TASK.c[column.name].label(f"old_{column.name}") for column in _AUDITED_COLUMNS
+)
+
+# Per-user cap on list requests, for clients polling in a tight loop (0 disables)
+TASK_LIST_RATE_LIMIT_PER_MINUTE = int(
+    os.getenv("TASK_LIST_RATE_LIMIT_PER_MINUTE", "120")
+)
+task_list_rate_limit = RateLimiter(TASK_LIST_RATE_LIMIT_PER_MINUTE)
+
+# TaskUpdate normalizes state to one of these keys
+_STATE_VALUES = {"done": True, "pending": False}
+
+# Serializes a whole task list in one pydantic-core call, bypassing FastAPI's
+# per-item response-model validation and the stdlib JSON encoder
+_TASK_LIST_ADAPTER = TypeAdapter(List[TaskResponse])
+
+
+def _task_json(task: TaskResponse, etag: Optional[str] = None) -> Response:
+    """Serialize one task with the schema's prebuilt serializer"""
+    return Response(
+        content=task.model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag} if etag else None,
+    )
+
+
+async def _update_owned_task(
+    db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID, patch: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Apply patch to the user's task and return its response columns plus the
+    pre-update audited values as old_<name>, or None if there is no such task
+    """
+    params = {"task_id": task_id, "owner_id": user_id}
+    if db.get_bind().dialect.name == "postgresql":
+        # One round-trip: the CTE locks and reads the row, the UPDATE writes
+        # it and returns both versions
+        result = await db.execute(
+            update(Task)
+            .where(Task.id == _OLD_TASK.c.id)
+            .values(**patch)
+            .returning(*_TASK_READ_COLUMNS, *_OLD_TASK_COLUMNS)
+            .execution_options(synchronize_session=False),
+            params,
+        )
+        row = result.mappings().one_or_none()
+        return dict(row) if row is not None else None
+
+    # SQLite cannot RETURNING columns of an UPDATE ... FROM source; read the
+    # old values first, in the same transaction
+    old = (await db.execute(_LOCK_OWNED_TASK, params)).mappings().one_or_none()
+    if old is None:
+        return None
+    result = await db.execute(
+        update(Task)
+        .where(*_OWNED_TASK)
+        .values(**patch)
+        .returning(*_TASK_READ_COLUMNS)
+        .execution_options(synchronize_session=False),
+        params,
+    )
+    row = dict(result.mappings().one())
+    row.update((f"old_{column.name}", old[column.name]) for column in _AUDITED_COLUMNS)
+    return row
+
+
+def _encode_cursor(created_at: datetime, task_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the task after which the next page starts"""
+    raw = f"{created_at.isoformat()}|{task_id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of _encode_cursor; malformed cursors are a client error"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, task_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(hex=task_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
 # Create router for task endpoints
 router = APIRouter(
     prefix="/tasks",
@@ -23,9 +158,9 @@ router = APIRouter(
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task: TaskCreate,
-    request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    ctx: RequestContext = Depends(get_request_context),
 ):
     """
     Create a new task (async).
@@ -35,19 +170,21 @@ async def create_task(
 
     Requires authentication.
     """
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    current_user, client_ip, user_agent = ctx.user, ctx.client_ip, ctx.user_agent
 
     try:
         db_task = Task(
             title=task.title, description=task.description, user_id=current_user.id
         )
         db.add(db_task)
+        # Every column is filled in Python (ids, timestamps) and the session
+        # keeps attributes loaded after commit, so no refresh SELECT is needed
         await db.commit()
-        await db.refresh(db_task)
+        invalidate_user_tasks(current_user.id)
 
-        # Log audit event
-        AuditLogger.log_user_action(
+        # Log audit event once the response has been sent
+        background_tasks.add_task(
+            AuditLogger.log_user_action,
             user_id=str(current_user.id),
             action="task_created",
             resource="task",
@@ -57,12 +194,14 @@ async def create_task(
             user_agent=user_agent,
         )
 
-        logger.info(f"Task created by user {current_user.username}: {db_task.title}")
+        logger.info("Task created by user %s: %s", current_user.username, db_task.title)
         return db_task
 
     except Exception as e:
         logger.error(
-            f"Error creating task for user {current_user.username}: {str(e)}",
+            "Error creating task for user %s: %s",
+            current_user.username,
+            e,
             extra={
                 "user_id": str(current_user.id),
                 "task_title": task.title,
@@ -76,57 +215,87 @@ async def create_task(
         )
 
 
-@router.get("/", response_model=List[TaskResponse])
+@router.get(
+    "/",
+    response_model=List[TaskResponse],
+    dependencies=[Depends(task_list_rate_limit)],
+)
 async def read_tasks(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Retrieve current user's tasks with optional filtering (async).
 
-    - **skip**: Number of tasks to skip (for pagination)
-    - **limit**: Maximum number of tasks to return (max 1000 for performance)
+    - **skip**: Number of tasks to skip (deprecated offset pagination, ignored with a cursor)
+    - **limit**: Maximum number of tasks to return (1-1000)
+    - **cursor**: Value of a previous page's X-Next-Cursor header (keyset pagination)
 
     Requires authentication. Only returns tasks belonging to the authenticated user.
+    A full page carries an X-Next-Cursor header pointing at the next one.
     """
-    # Limit maximum results for performance
-    if limit > 1000:
-        limit = 1000
-
-    try:
-        # Build query with user filter
-        statement = select(Task).where(Task.user_id == current_user.id)
+    # Decoded up front so a bad cursor is a 400, not a retrieval error
+    position = _decode_cursor(cursor) if cursor else None
+
+    async def load_page() -> CachedPage:
+        try:
+            # Build query with user filter
+            statement = select(*_TASK_READ_COLUMNS).where(
+                Task.user_id == current_user.id
+            )
 
-        # Add ordering for consistent pagination
-        statement = statement.order_by(Task.created_at.desc())
+            # Newest first; id breaks created_at ties so pages never overlap
+            statement = statement.order_by(Task.created_at.desc(), Task.id.desc())
 
-        # Apply pagination
-        statement = statement.offset(skip).limit(limit)
+            # Apply pagination: seek past the cursor (an index range scan) or,
+            # for legacy clients, skip rows with OFFSET
+            if position is not None:
+                statement = statement.where(tuple_(Task.created_at, Task.id) < position)
+            elif skip:
+                statement = statement.offset(skip)
+            statement = statement.limit(limit)
 
-        # Execute async query
-        result = await db.execute(statement)
-        tasks = result.scalars().all()
+            # Execute async query
+            result = await db.execute(statement)
+            # Rows come straight from the database, so skip re-validation
+            tasks = [TaskResponse.model_construct(**row) for row in result.mappings()]
 
-        logger.debug(f"Retrieved {len(tasks)} tasks for user {current_user.username}")
-        return tasks
+            logger.debug(
+                "Retrieved %s tasks for user %s", len(tasks), current_user.username
+            )
+            headers = None
+            if tasks and len(tasks) == limit:
+                last = tasks[-1]
+                headers = {"X-Next-Cursor": _encode_cursor(last.created_at, last.id)}
+            return _TASK_LIST_ADAPTER.dump_json(tasks), headers
+
+        except Exception as e:
+            logger.error(
+                "Error retrieving tasks for user %s: %s",
+                current_user.username,
+                e,
+                extra={"user_id": str(current_user.id)},
+                exc_info=True,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error retrieving tasks",
+            )
 
-    except Exception as e:
-        logger.error(
-            f"Error retrieving tasks for user {current_user.username}: {str(e)}",
-            extra={"user_id": str(current_user.id)},
-            exc_info=True,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error retrieving tasks",
-        )
+    # Repeat polls of an unchanged list come from the page cache, and
+    # concurrent misses for the same page wait on one query
+    page_key = (0 if cursor else skip, limit, cursor)
+    content, headers = await load_page_once(current_user.id, page_key, load_page)
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def read_task(
     task_id: uuid.UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -134,29 +303,39 @@ async def read_task(
     Get a specific task by ID (async).
 
     Requires authentication. Only returns task if it belongs to the authenticated user.
+    Supports If-None-Match: an unchanged task is answered with 304 Not Modified.
     """
     try:
         result = await db.execute(
-            select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
+            _SELECT_OWNED_TASK, {"task_id": task_id, "owner_id": current_user.id}
         )
-        task = result.scalar_one_or_none()
+        row = result.mappings().one_or_none()
 
-        if not task:
+        if row is None:
             logger.warning(
-                f"User {current_user.username} tried to access non-existent task: {task_id}",
+                "User %s tried to access non-existent task: %s",
+                current_user.username,
+                task_id,
                 extra={"user_id": str(current_user.id), "task_id": str(task_id)},
             )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
             )
 
-        return task
+        etag = weak_etag(row["id"], row["updated_at"])
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return _task_json(TaskResponse.model_construct(**row), etag)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(
-            f"Error retrieving task {task_id} for user {current_user.username}: {str(e)}",
+            "Error retrieving task %s for user %s: %s",
+            task_id,
+            current_user.username,
+            e,
             extra={"user_id": str(current_user.id), "task_id": str(task_id)},
             exc_info=True,
         )
@@ -170,32 +349,38 @@ async def read_task(
 async def update_task(
     task_id: uuid.UUID,
     task_update: TaskUpdate,
-    request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    ctx: RequestContext = Depends(get_request_context),
 ):
     """
     Update a task (async).
 
     - **title**: New task title (optional)
     - **description**: New task description (optional)
-    - **is_done**: New completion status (optional)
+    - **state**: New state, "done" or "pending" (optional)
 
     Requires authentication. Only updates task if it belongs to the authenticated user.
     """
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    current_user, client_ip, user_agent = ctx.user, ctx.client_ip, ctx.user_agent
 
     try:
-        # Find task
-        result = await db.execute(
-            select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
-        )
-        task = result.scalar_one_or_none()
-
-        if not task:
+        # Only fields that were actually provided are written
+        patch = task_update.model_dump(exclude_none=True)
+        if "state" in patch:
+            patch["state"] = _STATE_VALUES[patch["state"]]
+        submitted = list(patch)
+        patch["updated_at"] = utcnow()  # Stamped by the database
+
+        # Update and read back the task, old values included; the ownership
+        # filter doubles as the existence check
+        row = await _update_owned_task(db, task_id, current_user.id, patch)
+
+        if row is None:
             logger.warning(
-                f"User {current_user.username} tried to update non-existent task: {task_id}",
+                "User %s tried to update non-existent task: %s",
+                current_user.username,
+                task_id,
                 extra={
                     "user_id": str(current_user.id),
                     "task_id": str(task_id),
@@ -206,53 +391,22 @@ async def update_task(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
             )
 
-        # Store original values for audit
-        original_values = {
-            "title": task.title,
-            "description": task.description,
-            "is_done": task.is_done,
-        }
+        await db.commit()
+        invalidate_user_tasks(current_user.id)
+        task = TaskResponse.model_construct(
+            **{column.key: row[column.key] for column in _TASK_READ_COLUMNS}
+        )
 
-        # Update task fields
-        if task_update.title is not None:
-            task.title = task_update.title
-        if task_update.description is not None:
-            task.description = task_update.description
-        if task_update.is_done is not None:
-            task.is_done = task_update.is_done
+        # Prepare change details for audit: submitted fields whose value moved
+        changes = {
+            field: {"from": row[f"old_{field}"], "to": row[field]}
+            for field in submitted
+            if row[f"old_{field}"] != row[field]
+        }
 
-        await db.commit()
-        await db.refresh(task)
-
-        # Prepare change details for audit
-        changes = {}
-        if (
-            task_update.title is not None
-            and task_update.title != original_values["title"]
-        ):
-            changes["title"] = {
-                "from": original_values["title"],
-                "to": task_update.title,
-            }
-        if (
-            task_update.description is not None
-            and task_update.description != original_values["description"]
-        ):
-            changes["description"] = {
-                "from": original_values["description"],
-                "to": task_update.description,
-            }
-        if (
-            task_update.is_done is not None
-            and task_update.is_done != original_values["is_done"]
-        ):
-            changes["is_done"] = {
-                "from": original_values["is_done"],
-                "to": task_update.is_done,
-            }
-
-        # Log audit event
-        AuditLogger.log_user_action(
+        # Log audit event once the response has been sent
+        background_tasks.add_task(
+            AuditLogger.log_user_action,
             user_id=str(current_user.id),
             action="task_updated",
             resource="task",
@@ -263,16 +417,21 @@ async def update_task(
         )
 
         logger.info(
-            f"Task updated by user {current_user.username}: {task.title}",
+            "Task updated by user %s: %s",
+            current_user.username,
+            task.title,
             extra={"changes": changes},
         )
-        return task
+        return _task_json(task, weak_etag(task.id, task.updated_at))
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(
-            f"Error updating task {task_id} for user {current_user.username}: {str(e)}",
+            "Error updating task %s for user %s: %s",
+            task_id,
+            current_user.username,
+            e,
             extra={
                 "user_id": str(current_user.id),
                 "task_id": str(task_id),
@@ -289,27 +448,30 @@ async def update_task(
 @router.delete("/{task_id}")
 async def delete_task(
     task_id: uuid.UUID,
-    request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    ctx: RequestContext = Depends(get_request_context),
 ):
     """
     Delete a task (async).
 
     Requires authentication. Only allows deleting tasks that belong to the authenticated user.
     """
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
+    current_user, client_ip, user_agent = ctx.user, ctx.client_ip, ctx.user_agent
 
     try:
+        # Delete in a single round-trip; the returned columns feed the audit
+        # log and an empty result means the task does not exist for this user
         result = await db.execute(
-            select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
+            _DELETE_OWNED_TASK, {"task_id": task_id, "owner_id": current_user.id}
         )
-        task = result.scalar_one_or_none()
+        row = result.mappings().one_or_none()
 
-        if not task:
+        if row is None:
             logger.warning(
-                f"User {current_user.username} tried to delete non-existent task: {task_id}",
+                "User %s tried to delete non-existent task: %s",
+                current_user.username,
+                task_id,
                 extra={
                     "user_id": str(current_user.id),
                     "task_id": str(task_id),
@@ -320,18 +482,15 @@ async def delete_task(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
             )
 
-        # Store task info for audit before deletion
-        task_info = {
-            "title": task.title,
-            "description": task.description,
-            "is_done": task.is_done,
-        }
-
-        await db.delete(task)
         await db.commit()
+        invalidate_user_tasks(current_user.id)
+
+        # Store task info for audit
+        task_info = dict(row)
 
-        # Log audit event
-        AuditLogger.log_user_action(
+        # Log audit event once the response has been sent
+        background_tasks.add_task(
+            AuditLogger.log_user_action,
             user_id=str(current_user.id),
             action="task_deleted",
             resource="task",
@@ -342,7 +501,7 @@ async def delete_task(
         )
 
         logger.info(
-            f"Task deleted by user {current_user.username}: {task_info['title']}"
+            "Task deleted by user %s: %s", current_user.username, task_info["title"]
         )
         return {"message": "Task deleted successfully"}
 
@@ -350,7 +509,10 @@ async def delete_task(
         raise
     except Exception as e:
         logger.error(
-            f"Error deleting task {task_id} for user {current_user.username}: {str(e)}",
+            "Error deleting task %s for user %s: %s",
+            task_id,
+            current_user.username,
+            e,
             extra={
                 "user_id": str(current_user.id),
                 "task_id": str(task_id),
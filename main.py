@@ -1,9 +1,17 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from app.core.database import create_tables, close_async_engine
+from app.core.database import (
+    CREATE_TABLES,
+    WARM_POOL,
+    create_tables,
+    close_async_engine,
+    warm_pool,
+)
 from app.routers import tasks, auth
 from app.core.exceptions import (
     http_exception_handler,
@@ -12,7 +20,7 @@ from app.core.exceptions import (
     starlette_exception_handler,
 )
 from app.core.middleware import LoggingMiddleware, PerformanceLoggingMiddleware
-from app.core.logging_config import setup_logging, get_logger
+from app.core.logging_config import setup_logging, stop_logging, get_logger
 import time
 from contextlib import asynccontextmanager
 
@@ -26,8 +34,12 @@ async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events"""
     # Startup
     try:
-        await create_tables()
-        logger.info("Database initialized successfully!")
+        if CREATE_TABLES:
+            await create_tables()
+            logger.info("Database initialized successfully!")
+        if WARM_POOL:
+            await warm_pool()
+            logger.info("Database connection pool warmed up.")
     except Exception as e:
         logger.error(f"Error initializing database: {e}", exc_info=True)
         logger.error(
@@ -43,6 +55,7 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error closing database connections: {e}", exc_info=True)
     logger.info("Application shutting down...")
+    stop_logging()
 
 
 # Crear la instancia de FastAPI con configuración de producción
@@ -53,6 +66,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    # orjson encodes dict/list endpoint results much faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
 # Add logging middleware (should be added first)
@@ -79,14 +94,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (task lists) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Add custom middleware for performance monitoring
 @app.middleware("http")
 async def add_process_time_header(request, call_next):
     """Add response time header for monitoring"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     response.headers["X-Process-Time"] = str(f"{process_time:.4f} seconds")
     return response
 
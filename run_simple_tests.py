@@ -12,41 +12,21 @@ def run_simple_tests():
     print("🧪 Running Simple Taskify Tests")
     print("=" * 40)
 
-    # Test commands to run
-    test_commands = [
-        ("pytest tests/simple_test_api.py -v", "API Tests"),
-        ("pytest tests/simple_test_core.py -v", "Core Tests"),
-        ("pytest tests/simple_test_auth.py -v", "Auth Tests"),
-        ("pytest tests/simple_test_tasks.py -v", "Task Tests"),
+    # One pytest run over every suite: collection and app import are paid
+    # once, and pytest-xdist spreads the files over all cores (each file
+    # stays on one worker, as its tests build on each other)
+    test_files = [
+        "tests/simple_test_api.py",
+        "tests/simple_test_core.py",
+        "tests/simple_test_auth.py",
+        "tests/simple_test_tasks.py",
     ]
+    command = [sys.executable, "-m", "pytest", *test_files]
+    command += ["-n", "auto", "--dist=loadfile", "-q"]
 
-    results = []
+    result = subprocess.run(command, check=False)
 
-    for command, name in test_commands:
-        print(f"\n🚀 Running {name}...")
-        print("-" * 30)
-
-        try:
-            result = subprocess.run(command, shell=True, check=True)
-            results.append((name, True))
-            print(f"✅ {name} PASSED")
-        except subprocess.CalledProcessError:
-            results.append((name, False))
-            print(f"❌ {name} FAILED")
-
-    # Summary
-    print(f"\n📊 Summary")
-    print("=" * 40)
-    passed = sum(1 for _, success in results if success)
-    total = len(results)
-
-    for name, success in results:
-        status = "✅ PASSED" if success else "❌ FAILED"
-        print(f"{status} - {name}")
-
-    print(f"\nResult: {passed}/{total} test suites passed")
-
-    if passed == total:
+    if result.returncode == 0:
         print("🎉 All simple tests passed!")
         return 0
     else:
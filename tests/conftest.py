@@ -3,30 +3,179 @@ Simple test configuration
 Basic fixtures for testing without complex setup
 """
 
+import os
+import uuid
+
+# The app reads these at import time: a throwaway signing key, and no
+# connecting to PostgreSQL at startup (tests run against SQLite below)
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("CREATE_TABLES", "0")
+os.environ.setdefault("WARM_POOL", "0")
+# Minimal Argon2 costs: hashing is deliberately slow and would dominate tests
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "1024")
+
 import pytest
+import pytest_asyncio
 import asyncio
-from httpx import AsyncClient
+from typing import Dict, Optional
+from httpx import ASGITransport, AsyncClient
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from app.core.database import get_db
+from app.core.task_cache import clear_task_cache
+from app.core.user_cache import clear_user_cache
 from main import app
 
+try:
+    # Installed with uvicorn[standard] everywhere but Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@pytest_asyncio.fixture(scope="session")
+async def db_connection():
+    """
+    One in-memory SQLite connection for the session, holding an open
+    transaction; the app's sessions join it through SAVEPOINTs
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+    # emit BEGIN itself
+    @event.listens_for(engine.sync_engine, "connect")
+    def _no_autobegin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    async with engine.connect() as connection:
+        await connection.begin()
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+        # One connection serves all requests, so their sessions take turns
+        lock = asyncio.Lock()
+
+        async def get_test_db():
+            async with lock:
+                async with AsyncSession(
+                    bind=connection,
+                    join_transaction_mode="create_savepoint",
+                    expire_on_commit=False,
+                ) as session:
+                    yield session
+
+        app.dependency_overrides[get_db] = get_test_db
+        yield connection
+        app.dependency_overrides.pop(get_db, None)
+        await connection.rollback()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def db_rollback(request):
+    """Undo each test's writes (session-wide fixtures' data stays)"""
+    if "db_connection" not in request.fixturenames:
+        yield
+        return
+    connection: AsyncConnection = request.getfixturevalue("db_connection")
+    savepoint = await connection.begin_nested()
+    yield
+    await savepoint.rollback()
+    # Cached pages/users could describe rows that no longer exist
+    clear_task_cache()
+    clear_user_cache()
+
 
-@pytest.fixture
+# Clients are shared by the whole session so app startup runs once
+@pytest.fixture(scope="session")
 def client():
     """Simple test client"""
-    return TestClient(app)
+    with TestClient(app) as client:
+        yield client
 
 
-@pytest.fixture
-async def async_client():
+@pytest_asyncio.fixture(scope="session")
+async def async_client(db_connection: AsyncConnection):
     """Simple async client"""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         yield client
 
 
+# Users the task workflow tests act as; suffixed per session so reruns against
+# a persistent database never collide with an earlier run's users
+TASK_USER = f"taskuser_{uuid.uuid4().hex[:8]}"
+# A second account for checking that users cannot reach each other's tasks
+OTHER_USER = f"otheruser_{uuid.uuid4().hex[:8]}"
+WORKFLOW_USERS = {
+    TASK_USER: {"email": f"{TASK_USER}@example.com", "password": "TaskPass#2024"},
+    OTHER_USER: {"email": f"{OTHER_USER}@example.com", "password": "OtherPass#2024"},
+}
+
+
+async def _auth_headers(
+    client: AsyncClient, username: str, password: str, email: str
+) -> Optional[Dict[str, str]]:
+    """Register a user (already registered is fine), log in, return headers"""
+    user_data = {
+        "username": username,
+        "email": email,
+        "password": password,
+        "confirm_password": password,
+    }
+    await client.post("/auth/register", json=user_data)
+    login_data = {"username": username, "password": password}
+    response = await client.post("/auth/login", data=login_data)
+    if response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture(scope="session")
+async def user_headers(
+    async_client: AsyncClient,
+) -> Dict[str, Optional[Dict[str, str]]]:
+    """Auth headers for WORKFLOW_USERS, set up concurrently once per session"""
+    headers = await asyncio.gather(
+        *(
+            _auth_headers(async_client, username, **info)
+            for username, info in WORKFLOW_USERS.items()
+        )
+    )
+    return dict(zip(WORKFLOW_USERS, headers))
+
+
+@pytest_asyncio.fixture(scope="session")
+async def auth_headers(
+    user_headers: Dict[str, Optional[Dict[str, str]]],
+) -> Dict[str, str]:
+    """Authorization header for the task user, shared by every test needing one"""
+    headers = user_headers[TASK_USER]
+    assert headers is not None, "Login failed"
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def other_auth_headers(
+    user_headers: Dict[str, Optional[Dict[str, str]]],
+) -> Dict[str, str]:
+    """Authorization header for a second user who owns none of the task user's tasks"""
+    headers = user_headers[OTHER_USER]
+    assert headers is not None, "Login failed"
+    return headers
+
+
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.new_event_loop()
+    """Create event loop for async tests (uvloop when available)"""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
     yield loop
     loop.close()
 
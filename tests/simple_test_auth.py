@@ -3,8 +3,16 @@ Simple Authentication Tests
 Basic tests for user registration and login
 """
 
+import uuid
+
 import pytest
 from httpx import AsyncClient
+from passlib.hash import bcrypt
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core import user_cache
+from app.models.models import User
 
 
 class TestSimpleAuth:
@@ -12,44 +20,102 @@ class TestSimpleAuth:
 
     async def test_user_registration(self, async_client: AsyncClient):
         """Test basic user registration"""
+        username = f"newuser_{uuid.uuid4().hex[:8]}"
         user_data = {
-            "username": "newuser",
-            "email": "newuser@example.com",
-            "password": "password123",
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "NewUser#Pass1",
+            "confirm_password": "NewUser#Pass1",
         }
 
         response = await async_client.post("/auth/register", json=user_data)
 
-        # Should succeed or fail gracefully
-        assert response.status_code in [201, 400, 422]
+        assert response.status_code == 201
+        data = response.json()
+        assert "username" in data
+        assert "email" in data
+        assert "password" not in data  # Password should not be returned
+
+    async def test_registration_drops_cached_user(self, async_client: AsyncClient):
+        """Test that registering a username evicts any cached row for it"""
+        username = f"cacheduser_{uuid.uuid4().hex[:8]}"
+        user_cache._user_cache[username] = {"username": username}
+        password = "CachedUser#Pass1"
 
-        if response.status_code == 201:
-            data = response.json()
-            assert "username" in data
-            assert "email" in data
-            assert "password" not in data  # Password should not be returned
+        response = await async_client.post(
+            "/auth/register",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": password,
+                "confirm_password": password,
+            },
+        )
+
+        assert response.status_code == 201
+        assert username not in user_cache._user_cache
 
     async def test_user_login(self, async_client: AsyncClient):
         """Test basic user login"""
         # First register a user
+        username = f"loginuser_{uuid.uuid4().hex[:8]}"
         user_data = {
-            "username": "loginuser",
-            "email": "loginuser@example.com",
-            "password": "password123",
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "LoginUser#Pass1",
+            "confirm_password": "LoginUser#Pass1",
         }
 
         register_response = await async_client.post("/auth/register", json=user_data)
+        assert register_response.status_code == 201
+
+        # Try to login
+        login_data = {"username": username, "password": "LoginUser#Pass1"}
+
+        login_response = await async_client.post("/auth/login", data=login_data)
+
+        assert login_response.status_code == 200
+        data = login_response.json()
+        assert "access_token" in data
+        assert "token_type" in data
+
+    async def test_login_upgrades_bcrypt_hash(
+        self, async_client: AsyncClient, db_connection: AsyncConnection
+    ):
+        """Test that logging in replaces a legacy bcrypt hash with Argon2id"""
+        username = f"legacyuser_{uuid.uuid4().hex[:8]}"
+        password = "LegacyUser#Pass1"
+        register_response = await async_client.post(
+            "/auth/register",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": password,
+                "confirm_password": password,
+            },
+        )
+        assert register_response.status_code == 201
+        by_username = User.username == username
+        await db_connection.execute(
+            update(User)
+            .where(by_username)
+            .values(hashed_password=bcrypt.using(rounds=4).hash(password))
+        )
 
-        if register_response.status_code == 201:
-            # Try to login
-            login_data = {"username": "loginuser", "password": "password123"}
+        user_cache._user_cache[username] = {"username": username}
 
-            login_response = await async_client.post("/auth/login", data=login_data)
+        login_data = {"username": username, "password": password}
+        login_response = await async_client.post("/auth/login", data=login_data)
 
-            if login_response.status_code == 200:
-                data = login_response.json()
-                assert "access_token" in data
-                assert "token_type" in data
+        assert login_response.status_code == 200
+        assert username not in user_cache._user_cache
+        stored = await db_connection.scalar(
+            select(User.hashed_password).where(by_username)
+        )
+        assert stored.startswith("$argon2id$")
+        # The upgraded hash still accepts the password
+        login_response = await async_client.post("/auth/login", data=login_data)
+        assert login_response.status_code == 200
 
     async def test_login_with_wrong_password(self, async_client: AsyncClient):
         """Test login with incorrect password"""
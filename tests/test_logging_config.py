@@ -0,0 +1,49 @@
+"""
+Logging Configuration Tests
+Tests for the buffered rotating file handler and the audit/security loggers
+"""
+
+import logging
+
+import pytest
+
+from app.core.logging_config import BufferedRotatingFileHandler, _queue_listeners
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestBufferedRotatingFileHandler:
+    """Write batching tests"""
+
+    def test_buffered_records_written_on_flush(self, tmp_path):
+        """Test that records wait in the buffer until it is flushed"""
+        log_file = tmp_path / "app.log"
+        handler = BufferedRotatingFileHandler(log_file, flush_interval=60)
+        try:
+            handler.handle(_record("buffered"))
+            assert log_file.read_text() == ""
+
+            handler.flush()
+            assert log_file.read_text() == "buffered\n"
+        finally:
+            handler.close()
+
+    def test_unbuffered_records_written_immediately(self, tmp_path):
+        """Test that buffer_size=0 writes each record as it is emitted"""
+        log_file = tmp_path / "audit.log"
+        handler = BufferedRotatingFileHandler(log_file, buffer_size=0)
+        try:
+            handler.handle(_record("first"))
+            assert log_file.read_text() == "first\n"
+            handler.handle(_record("second"))
+            assert log_file.read_text() == "first\nsecond\n"
+        finally:
+            handler.close()
+
+    @pytest.mark.parametrize("logger_name", ["audit", "security"])
+    def test_audit_and_security_logs_unbuffered(self, logger_name):
+        """Test that audit and security events are never held in a buffer"""
+        (handler,) = _queue_listeners[logger_name].handlers
+        assert handler.buffer_size == 0
@@ -3,8 +3,26 @@ Simple Core Tests
 Basic tests for core functionality
 """
 
+import time
+import uuid
+
 import pytest
-from app.core.auth import get_password_hash, verify_password, create_access_token
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.auth import (
+    get_password_hash,
+    verify_password,
+    create_access_token,
+    verify_token,
+    secure_str_eq,
+    _token_cache,
+    _token_cache_key,
+)
+from app.core.etag import etag_matches, weak_etag
+from app.models.models import uuid7
+from app.routers.tasks import _decode_cursor, _encode_cursor
 
 
 class TestSimpleCore:
@@ -45,3 +63,79 @@ class TestSimpleCore:
         # But both should verify the same password
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
+
+    def test_token_verification_is_cached(self):
+        """Test that a verified token is served from the cache"""
+        token = create_access_token(data={"sub": "cacheduser"})
+        credentials_exception = HTTPException(status_code=401)
+
+        assert verify_token(token, credentials_exception) == "cacheduser"
+        assert _token_cache_key(token) in _token_cache
+
+        # Second call should return the same username
+        assert verify_token(token, credentials_exception) == "cacheduser"
+
+        # Invalid tokens are still rejected
+        with pytest.raises(HTTPException):
+            verify_token(token + "tampered", credentials_exception)
+
+    def test_expired_or_malformed_token_rejected(self):
+        """Test that expired and malformed tokens are rejected"""
+        credentials_exception = HTTPException(status_code=401)
+        expired = create_access_token(
+            data={"sub": "testuser"}, expires_delta=timedelta(seconds=-10)
+        )
+
+        for token in (expired, "not-a-jwt", "a.b.c"):
+            with pytest.raises(HTTPException):
+                verify_token(token, credentials_exception)
+
+    def test_secure_string_comparison(self):
+        """Test constant-time secret comparison helper"""
+        assert secure_str_eq("secret-value", "secret-value") is True
+        assert secure_str_eq("secret-value", "secret-valuf") is False
+        assert secure_str_eq("secret", "secret-value") is False
+
+    def test_uuid7_primary_keys(self):
+        """Test that generated primary keys are time-ordered version 7 UUIDs"""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+
+        assert isinstance(first, uuid.UUID)
+        assert first.version == 7
+        assert first.variant == uuid.RFC_4122
+        assert first < second
+        assert len({uuid7() for _ in range(1000)}) == 1000
+
+    def test_weak_etag_matching(self):
+        """Test If-None-Match handling for weak ETags"""
+        resource_id = uuid.uuid4()
+        etag = weak_etag(resource_id, datetime(2024, 1, 1, 12, 0, 0, 5))
+        newer = weak_etag(resource_id, datetime(2024, 1, 1, 12, 0, 0, 6))
+        assert etag != newer
+
+        def request_with(header):
+            headers = [(b"if-none-match", header.encode())] if header else []
+            return Request({"type": "http", "headers": headers})
+
+        assert etag_matches(request_with(etag), etag) is True
+        assert etag_matches(request_with(etag[2:]), etag) is True  # strong form
+        assert etag_matches(request_with(f"{newer}, {etag}"), etag) is True
+        assert etag_matches(request_with("*"), etag) is True
+        assert etag_matches(request_with(newer), etag) is False
+        assert etag_matches(request_with(None), etag) is False
+
+    def test_task_cursor_round_trip(self):
+        """Test keyset pagination cursors encode and decode losslessly"""
+        created_at = datetime(2024, 1, 1, 12, 30, 45, 123456)
+        task_id = uuid7()
+
+        cursor = _encode_cursor(created_at, task_id)
+        assert "=" not in cursor
+        assert _decode_cursor(cursor) == (created_at, task_id)
+
+        for bad in ("!!bad", "bm90LWEtY3Vyc29y"):
+            with pytest.raises(HTTPException) as exc_info:
+                _decode_cursor(bad)
+            assert exc_info.value.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Schema Validation Tests
+Tests for request schema validators
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import UserBase, UserCreate, UserRegister
+
+
+def _register(password: str) -> UserRegister:
+    return UserRegister(
+        username="alice",
+        email="alice@example.com",
+        password=password,
+        confirm_password=password,
+    )
+
+
+class TestPasswordValidation:
+    """Password strength rules shared by registration schemas"""
+
+    def test_strong_password_accepted(self):
+        """Test that a password meeting every rule is accepted"""
+        assert _register("Str0ng!Pass").password == "Str0ng!Pass"
+
+    @pytest.mark.parametrize(
+        "password, message",
+        [
+            ("str0ng!pass", "uppercase"),
+            ("STR0NG!PASS", "lowercase"),
+            ("Strong!Pass", "number"),
+            ("Str0ngPass1", "special character"),
+        ],
+    )
+    def test_weak_password_rejected(self, password, message):
+        """Test that each missing character class is reported"""
+        with pytest.raises(ValidationError, match=message):
+            _register(password)
+
+    def test_sequential_patterns_rejected(self):
+        """Test that UserCreate rejects common keyboard sequences"""
+        with pytest.raises(ValidationError, match="sequential"):
+            UserCreate(username="alice", email="a@example.com", password="Qwer!9xZ")
+
+    def test_mismatched_confirmation_rejected(self):
+        """Test that registration requires the confirmation to match"""
+        with pytest.raises(ValidationError, match="do not match"):
+            UserRegister(
+                username="alice",
+                email="alice@example.com",
+                password="Str0ng!Pass",
+                confirm_password="Str0ng!Pasz",
+            )
+
+
+class TestEmailValidation:
+    """Email normalization and structural checks"""
+
+    def test_email_normalized(self):
+        """Test that emails are stripped and lowercased"""
+        user = UserBase(username="alice", email="  Alice@Example.COM ")
+        assert user.email == "alice@example.com"
+
+    @pytest.mark.parametrize(
+        "email, message",
+        [
+            ("alice.example.com", "should match pattern"),
+            ("a..b@example.com", "consecutive dots"),
+            (".alice@example.com", "cannot start with dot"),
+            ("a" * 65 + "@example.com", "local part cannot exceed"),
+            ("alice@-example.com", "hyphen"),
+        ],
+    )
+    def test_invalid_email_rejected(self, email, message):
+        """Test that malformed emails are rejected with a specific message"""
+        with pytest.raises(ValidationError, match=message):
+            UserBase(username="alice", email=email)
@@ -0,0 +1,127 @@
+"""
+Task List Cache Tests
+Tests for the page cache's single-flight loading and the list rate limiter
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import task_cache
+from app.core.rate_limit import RateLimiter
+from app.core.task_cache import (
+    clear_task_cache,
+    get_cached_page,
+    invalidate_user_tasks,
+    load_page_once,
+)
+from app.models.models import User, uuid7
+
+PAGE = (b"[]", None)
+PAGE_KEY = (0, 10, None)
+
+
+@pytest.fixture(autouse=True)
+def _clean_task_cache():
+    yield
+    clear_task_cache()
+
+
+class TestTaskListCache:
+    """Page cache single-flight tests"""
+
+    async def test_concurrent_page_misses_share_one_load(self):
+        """Test that concurrent misses for one page run a single load"""
+        user_id = uuid7()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return PAGE
+
+        pages = await asyncio.gather(
+            *(load_page_once(user_id, PAGE_KEY, loader) for _ in range(5))
+        )
+        # Now cached, so no further load
+        await load_page_once(user_id, PAGE_KEY, loader)
+
+        assert pages == [PAGE] * 5
+        assert len(calls) == 1
+
+    async def test_cancelled_owner_does_not_cancel_waiters(self):
+        """Test that waiters reload when the request running the load is cancelled"""
+        user_id = uuid7()
+        started = asyncio.Event()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.01)
+            return PAGE
+
+        owner = asyncio.create_task(load_page_once(user_id, PAGE_KEY, loader))
+        await started.wait()
+        waiter = asyncio.create_task(load_page_once(user_id, PAGE_KEY, loader))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        assert await waiter == PAGE
+        assert owner.cancelled()
+        assert len(calls) == 2
+
+    async def test_load_overlapping_a_write_is_not_cached(self):
+        """Test that a page loaded across an invalidation is not cached or shared"""
+        user_id = uuid7()
+        started = asyncio.Event()
+        release = asyncio.Event()
+        fresh = (b'[{"title": "new"}]', None)
+
+        async def stale_loader():
+            started.set()
+            await release.wait()
+            return PAGE
+
+        async def fresh_loader():
+            return fresh
+
+        loading = asyncio.create_task(load_page_once(user_id, PAGE_KEY, stale_loader))
+        await started.wait()
+        invalidate_user_tasks(user_id)  # a write commits mid-load
+
+        # A request after the write runs its own load instead of joining
+        fresh_load = load_page_once(user_id, PAGE_KEY, fresh_loader)
+        assert await asyncio.wait_for(fresh_load, timeout=1) == fresh
+
+        release.set()
+        assert await loading == PAGE
+        assert get_cached_page(user_id, PAGE_KEY) == fresh
+
+    async def test_zero_ttl_disables_caching(self, monkeypatch):
+        """Test that pages are loaded but not kept when the cache TTL is 0"""
+        monkeypatch.setattr(task_cache, "TASK_LIST_CACHE_TTL_SECONDS", 0)
+        user_id = uuid7()
+
+        async def loader():
+            return PAGE
+
+        assert await load_page_once(user_id, PAGE_KEY, loader) == PAGE
+        assert get_cached_page(user_id, PAGE_KEY) is None
+
+
+class TestRateLimiter:
+    """Per-user rate limiter tests"""
+
+    async def test_rate_limiter_rejects_over_budget(self):
+        """Test that the per-user rate limiter answers 429 past its budget"""
+        limiter = RateLimiter(max_requests=2, window_seconds=60)
+        user = User(id=uuid7(), username="limited", email="l@example.com")
+
+        await limiter(user)
+        await limiter(user)
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter(user)
+        assert exc_info.value.status_code == 429
+        assert "Retry-After" in exc_info.value.headers